@@ -1,53 +1,164 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, BackgroundTasks
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.middleware.gzip import GZipMiddleware
+from pymongo import AsyncMongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
+import re
+import time
+import hmac
+import hashlib
+import binascii
+import itertools
+import functools
+import asyncio
 import logging
+import shutil
+import tempfile
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable
 import uuid
-from datetime import datetime, timezone, timedelta
+from collections import Counter
+from datetime import date, datetime, timezone, timedelta
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 import jwt
+import orjson
+from jwt.utils import base64url_decode, base64url_encode
 import pandas as pd
-import io
+from openpyxl import load_workbook
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import aiosmtplib
 from email.message import EmailMessage
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # openpyxl read-only streaming is used instead
+    CalamineWorkbook = None
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # the shared Redis cache is optional; in-process caches still apply
+    aioredis = None
+    RedisError = Exception
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+logger = logging.getLogger(__name__)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(
+    mongo_url,
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', '10')),
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+    maxIdleTimeMS=30000,
+    # Fail fast with an error instead of queueing indefinitely when the pool is exhausted
+    waitQueueTimeoutMS=int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2500')),
+    serverSelectionTimeoutMS=5000,
+    connectTimeoutMS=10000,
+    retryWrites=True,
+    # BSON dates come back as aware UTC datetimes, so they serialize with an offset
+    tz_aware=True
+)
 db = client[os.environ['DB_NAME']]
 
 # JWT Configuration
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
+JWT_SECRET_BYTES = JWT_SECRET.encode('utf-8')
+# Encoded header of the tokens create_jwt_token issues, used to pick the fast verify path
+JWT_HS256_HEADER = base64url_encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).decode('ascii')
+
+# Optional Redis cache shared by all workers (disabled when REDIS_URL is unset)
+REDIS_URL = os.environ.get('REDIS_URL', '')
+redis_client = aioredis.from_url(REDIS_URL) if aioredis is not None and REDIS_URL else None
+USER_CACHE_TTL_SECONDS = 300
+CONTACT_CACHE_TTL_SECONDS = 300
+RESPONSE_CACHE_TTL_SECONDS = 20
+
+# Keys under which imported contact data holds the shop name, in lookup order
+SHOP_NAME_KEYS = ('shop_name', 'Shop_Name', 'Shop Name')
+
+# Contact fields that activity logging reads (phone as the target, names for the details)
+CONTACT_LOG_FIELDS = {
+    "id": 1, "phone": 1, "customer_name": 1, "data.name": 1,
+    **{f"data.{key}": 1 for key in SHOP_NAME_KEYS}
+}
+
+# Fields whose words contact search matches, by prefix, through each contact's search_keys
+CONTACT_SEARCH_FIELDS = [
+    "phone", "customer_name",
+    "data.shop_name", "data.business_name", "data.name", "data.customer_name", "data.owner_name",
+    "data.address", "data.city", "data.state", "data.location", "data.company", "data.category"
+]
+
+# Contact import batching (documents per bulk_write upsert call, and how many batches are in flight at once)
+IMPORT_BATCH_SIZE = 1000
+IMPORT_WRITE_CONCURRENCY = int(os.environ.get('IMPORT_WRITE_CONCURRENCY', '4'))
+# Workbooks larger than this are streamed with openpyxl instead of loaded whole by calamine
+EXCEL_STREAMING_THRESHOLD_BYTES = int(os.environ.get('EXCEL_STREAMING_THRESHOLD_MB', '50')) * 1024 * 1024
 
 # Security
 security = HTTPBearer()
 
+# Authenticated users by token digest, so most requests skip the JWT check and user lookup
+auth_cache = TTLCache(maxsize=10000, ttl=300)
+
+# Contact field writes waiting to be flushed in bulk, keyed by contact id
+pending_contact_updates: Dict[str, Dict[str, Any]] = {}
+CONTACT_FLUSH_INTERVAL_SECONDS = 0.5
+
+# Activity log entries waiting to be written; a batch goes out when it is full
+# or ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS after its first entry
+activity_log_queue: asyncio.Queue = asyncio.Queue()
+ACTIVITY_LOG_BATCH_SIZE = 500
+ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS = 0.1
+
+# New passwords are hashed with argon2id; bcrypt hashes ($2b$...) from older accounts still verify
+password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+
+# Worker threads for password hashing/verification
+password_pool = ThreadPoolExecutor(max_workers=4)
+
 # Create the main app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # Scheduler for follow-up alerts
 scheduler = AsyncIOScheduler()
 
+# Idle SMTP sessions for notification emails, opened lazily and reused; at most
+# SMTP_MAX_SESSIONS sends run at once, each on its own session
+SMTP_MAX_SESSIONS = int(os.environ.get('SMTP_MAX_SESSIONS', '4'))
+smtp_sessions: List[aiosmtplib.SMTP] = []
+smtp_slots = asyncio.Semaphore(SMTP_MAX_SESSIONS)
+
+def utc_now() -> datetime:
+    """Current UTC time, for the fields stored as BSON dates"""
+    return datetime.now(timezone.utc)
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string, the format other stored timestamps use"""
+    return utc_now().isoformat()
+
 # ============ MODELS ============
 
 class User(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     email: EmailStr
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = Field(default_factory=utc_now_iso)
 
 class UserSignup(BaseModel):
     email: EmailStr
@@ -64,8 +175,8 @@ class Contact(BaseModel):
     customer_name: Optional[str] = None
     status: str = "None"
     data: Dict[str, Any] = {}  # Flexible schema for other columns
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = Field(default_factory=utc_now_iso)
+    updated_at: str = Field(default_factory=lambda data: data['created_at'])
     last_call_at: Optional[str] = None
 
 class ContactCreate(BaseModel):
@@ -86,7 +197,7 @@ class Note(BaseModel):
     contact_id: str
     user_id: str
     content: str
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = Field(default_factory=utc_now_iso)
 
 class NoteCreate(BaseModel):
     contact_id: str
@@ -98,15 +209,15 @@ class FollowUp(BaseModel):
     contact_id: str
     user_id: str
     user_email: str
-    follow_up_date: str
+    follow_up_date: datetime
     notes: Optional[str] = None
     status: str = "pending"  # pending, completed, overdue
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = Field(default_factory=utc_now_iso)
     notified: bool = False
 
 class FollowUpCreate(BaseModel):
     contact_id: str
-    follow_up_date: str
+    follow_up_date: datetime
     notes: Optional[str] = None
 
 class Meeting(BaseModel):
@@ -121,7 +232,7 @@ class Meeting(BaseModel):
     notes: Optional[str] = None
     attendees: List[Dict[str, Any]] = []
     status: str = "scheduled"  # scheduled, completed, cancelled
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = Field(default_factory=utc_now_iso)
 
 class MeetingCreate(BaseModel):
     title: str
@@ -139,7 +250,7 @@ class ActivityLog(BaseModel):
     action: str
     target: Optional[str] = None
     details: Optional[str] = None
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timestamp: str = Field(default_factory=utc_now_iso)
 
 class Demo(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -147,28 +258,43 @@ class Demo(BaseModel):
     contact_id: str
     user_id: str
     user_email: str
-    given_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    given_at: datetime = Field(default_factory=utc_now)
     watched: bool = False
-    watched_at: Optional[str] = None
+    watched_at: Optional[datetime] = None
     notes: Optional[str] = None
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = Field(default_factory=utc_now_iso)
+    updated_at: str = Field(default_factory=lambda data: data['created_at'])
 
 class DemoCreate(BaseModel):
     contact_id: str
     notes: Optional[str] = None
 
 class DemoWatchUpdate(BaseModel):
-    watched_at: Optional[str] = None
+    watched_at: Optional[datetime] = None
 
 # ============ HELPER FUNCTIONS ============
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    # Password hashing is deliberately slow; run it on the password pool so the event loop stays free
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_pool, password_hasher.hash, password)
 
-def verify_password(password: str, hashed: str) -> bool:
+def check_password(password: str, hashed: str) -> bool:
+    if hashed.startswith('$argon2'):
+        try:
+            return password_hasher.verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
+async def verify_password(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_pool, check_password, password, hashed)
+
+def password_needs_rehash(hashed: str) -> bool:
+    """True for legacy bcrypt hashes and argon2 hashes made with other parameters"""
+    return not hashed.startswith('$argon2') or password_hasher.check_needs_rehash(hashed)
+
 def create_jwt_token(user_id: str, email: str) -> str:
     expiration = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
     payload = {
@@ -179,6 +305,28 @@ def create_jwt_token(user_id: str, email: str) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 def decode_jwt_token(token: str) -> dict:
+    # Fast path for the tokens we issue ourselves: verify the HS256 signature directly
+    header_b64, _, rest = token.partition('.')
+    if header_b64 == JWT_HS256_HEADER and rest.count('.') == 1:
+        payload_b64, signature_b64 = rest.split('.')
+        try:
+            signature = base64url_decode(signature_b64)
+            expected = hmac.new(JWT_SECRET_BYTES, f"{header_b64}.{payload_b64}".encode('ascii'), hashlib.sha256).digest()
+            if not hmac.compare_digest(signature, expected):
+                raise HTTPException(status_code=401, detail="Invalid token")
+            payload = orjson.loads(base64url_decode(payload_b64))
+        except (ValueError, binascii.Error, UnicodeEncodeError):
+            raise HTTPException(status_code=401, detail="Invalid token")
+        if not isinstance(payload, dict):
+            raise HTTPException(status_code=401, detail="Invalid token")
+        exp = payload.get('exp')
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise HTTPException(status_code=401, detail="Invalid token")
+            if exp <= time.time():
+                raise HTTPException(status_code=401, detail="Token has expired")
+        return payload
+    
     try:
         return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
@@ -186,23 +334,480 @@ def decode_jwt_token(token: str) -> dict:
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def cache_get_many(keys: List[str]) -> List[Optional[Any]]:
+    """Cached values for keys (None for misses); all misses when Redis is off or failing"""
+    if redis_client is None or not keys:
+        return [None] * len(keys)
+    try:
+        values = await redis_client.mget(keys)
+    except RedisError as e:
+        logging.warning(f"Redis read failed, falling back to MongoDB: {str(e)}")
+        return [None] * len(keys)
+    return [orjson.loads(value) if value is not None else None for value in values]
+
+async def cache_set_many(items: Dict[str, Any], ttl: int):
+    if redis_client is None or not items:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, orjson.dumps(value), ex=ttl)
+            await pipe.execute()
+    except RedisError as e:
+        logging.warning(f"Redis write failed: {str(e)}")
+
+async def cache_delete(*keys: str):
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError as e:
+        logging.warning(f"Redis delete failed: {str(e)}")
+
+async def bump_cache_generation(namespace: str):
+    """Invalidate every cached response in a namespace by moving it to a new generation"""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.incr(f"gen:{namespace}")
+    except RedisError as e:
+        logging.warning(f"Redis write failed: {str(e)}")
+
+def cached_response(
+    namespace: str,
+    ttl: int = RESPONSE_CACHE_TTL_SECONDS,
+    before: Optional[Callable[[], Awaitable[Any]]] = None
+):
+    """Serve a read endpoint's result from Redis, keyed by its query parameters.
+
+    Entries expire after ttl seconds, and writes drop them all at once with
+    bump_cache_generation(namespace). Listings here are shared by every user, so
+    current_user is not part of the key. before runs on every call, ahead of the
+    lookup, for upkeep that cache hits must not skip.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            if before is not None:
+                await before()
+            if redis_client is None:
+                return await endpoint(**kwargs)
+            params = orjson.dumps({k: v for k, v in kwargs.items() if k != 'current_user'}, option=orjson.OPT_SORT_KEYS)
+            try:
+                generation = await redis_client.get(f"gen:{namespace}") or b"0"
+                cache_key = f"resp:{namespace}:{generation.decode()}:{endpoint.__name__}:{params.decode()}"
+            except RedisError as e:
+                logging.warning(f"Redis read failed, falling back to MongoDB: {str(e)}")
+                return await endpoint(**kwargs)
+            
+            cached, = await cache_get_many([cache_key])
+            if cached is not None:
+                return cached
+            result = await endpoint(**kwargs)
+            await cache_set_many({cache_key: result}, ttl)
+            return result
+        return wrapper
+    return decorator
+
+async def load_user(user_id: str) -> Optional[dict]:
+    """Fetch a user (without the password hash), read through Redis when it is configured"""
+    cache_key = f"user:{user_id}"
+    cached, = await cache_get_many([cache_key])
+    if cached is not None:
+        return cached
+    
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+    if user:
+        await cache_set_many({cache_key: user}, USER_CACHE_TTL_SECONDS)
+    return user
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     token = credentials.credentials
+    # Serve repeat requests for the same token from memory, never past the token's own expiry
+    cache_key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+    cached = auth_cache.get(cache_key)
+    if cached is not None:
+        user, expires_at = cached
+        if expires_at > time.time():
+            return user
+        auth_cache.pop(cache_key, None)
+    
     payload = decode_jwt_token(token)
-    user = await db.users.find_one({"id": payload['user_id']}, {"_id": 0})
+    user = await load_user(payload['user_id'])
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    # A token without exp never expires; the cache's own TTL still bounds the entry
+    auth_cache[cache_key] = (user, payload.get('exp', time.time() + auth_cache.ttl))
     return user
 
-async def log_activity(user_id: str, user_email: str, action: str, target: Optional[str] = None, details: Optional[str] = None):
-    log = ActivityLog(
-        user_id=user_id,
-        user_email=user_email,
-        action=action,
-        target=target,
-        details=details
+def log_activity(user_id: str, user_email: str, action: str, target: Optional[str] = None, details: Optional[str] = None):
+    # Internal write with known-good fields: build the ActivityLog document directly.
+    # Queued for activity_log_flusher rather than inserted on the request path, so callers
+    # enqueue inline.
+    activity_log_queue.put_nowait({
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "user_email": user_email,
+        "action": action,
+        "target": target,
+        "details": details,
+        "timestamp": utc_now_iso()
+    })
+
+@functools.lru_cache(maxsize=32)
+def followup_date_range(date_filter: str, today: date) -> Optional[Dict[str, datetime]]:
+    """follow_up_date range for a date filter (today, tomorrow, this_week), None for all.
+
+    Cached per UTC day; callers must not mutate the returned dict.
+    """
+    day_start = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
+    if date_filter == "today":
+        start_date, days = day_start, 1
+    elif date_filter == "tomorrow":
+        start_date, days = day_start + timedelta(days=1), 1
+    elif date_filter == "this_week":
+        # Today through the end of the day 7 days from now
+        start_date, days = day_start, 8
+    else:  # all
+        return None
+    end_date = start_date + timedelta(days=days) - timedelta(microseconds=1)
+    return {"$gte": start_date, "$lte": end_date}
+
+async def mark_followups_overdue(now: Optional[datetime] = None):
+    """Flag every pending follow-up dated before now as overdue, server-side in one write"""
+    now = now or utc_now()
+    result = await db.followups.update_many(
+        {"status": "pending", "follow_up_date": {"$lt": now}},
+        {"$set": {"status": "overdue"}}
     )
-    await db.activity_logs.insert_one(log.model_dump())
+    if result.modified_count:
+        await bump_cache_generation("followups")
+
+async def contacts_by_id(records: List[dict]) -> Dict[str, dict]:
+    """Fetch the contacts referenced by records' contact_id, keyed by id.
+
+    Cached contacts come from one Redis MGET; the rest from one $in query.
+    """
+    contact_ids = list({record['contact_id'] for record in records})
+    if not contact_ids:
+        return {}
+    cached = await cache_get_many([f"contact:{contact_id}" for contact_id in contact_ids])
+    found = {contact['id']: contact for contact in cached if contact is not None}
+    
+    missing = [contact_id for contact_id in contact_ids if contact_id not in found]
+    if missing:
+        contacts = await db.contacts.find({"id": {"$in": missing}}, {"_id": 0}).to_list(None)
+        await cache_set_many({f"contact:{contact['id']}": contact for contact in contacts}, CONTACT_CACHE_TTL_SECONDS)
+        found.update((contact['id'], contact) for contact in contacts)
+    return found
+
+async def load_contact(contact_id: str, fields: Optional[Dict[str, int]] = None) -> Optional[dict]:
+    """Fetch a contact, read through Redis when it is configured.
+
+    Without Redis, fields limits what is read from MongoDB; with Redis the whole
+    contact is cached so every caller can share the entry.
+    """
+    if fields is not None and redis_client is None:
+        return await db.contacts.find_one({"id": contact_id}, {"_id": 0, **fields})
+    return (await contacts_by_id([{"contact_id": contact_id}])).get(contact_id)
+
+async def adjust_contact_stats(changes: Dict[Optional[str], int]):
+    """Apply per-status changes to the contact counts kept in contact_status_counts"""
+    ops = [
+        UpdateOne({"_id": status}, {"$inc": {"count": change}}, upsert=True)
+        for status, change in changes.items() if change
+    ]
+    if ops:
+        await db.contact_status_counts.bulk_write(ops, ordered=False)
+
+async def rebuild_contact_stats():
+    """Recount contacts per status, correcting any drift in contact_status_counts.
+
+    Not safe alongside concurrent adjust_contact_stats calls; run it only from prepare_database.
+    """
+    # Sorting on status first lets the group read only the status index
+    by_status = await (await db.contacts.aggregate([
+        {"$sort": {"status": 1}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ])).to_list(None)
+    if by_status:
+        await db.contact_status_counts.bulk_write(
+            [UpdateOne({"_id": item["_id"]}, {"$set": {"count": item["count"]}}, upsert=True) for item in by_status],
+            ordered=False
+        )
+    await db.contact_status_counts.delete_many({"_id": {"$nin": [item["_id"] for item in by_status]}})
+
+async def invalidate_contacts(*contact_ids: str):
+    """Drop cached copies of contacts after they are changed or deleted"""
+    await cache_delete(*(f"contact:{contact_id}" for contact_id in contact_ids))
+
+async def attach_followup_contacts(followups: List[dict]):
+    """Resolve followup['contact'], dropping the key when the contact no longer exists.
+
+    Follow-ups carry a summary of their contact (None once it is deleted); only ones
+    created before that was stored need a contacts lookup.
+    """
+    missing = [followup for followup in followups if 'contact' not in followup]
+    contacts = await contacts_by_id(missing)
+    for followup in followups:
+        contact = followup.pop('contact') if 'contact' in followup else followup_contact(contacts.get(followup['contact_id']))
+        if contact:
+            followup['contact'] = contact
+
+async def meeting_log_context(meeting: dict) -> Tuple[str, str]:
+    """Activity log target and attendee summary for a meeting.
+
+    The target is the first attendee's contact phone, falling back to the meeting title.
+    """
+    attendees = meeting.get('attendees') or []
+    target_contact = None
+    if attendees and 'phone' in attendees[0]:
+        target_contact = await db.contacts.find_one({"phone": attendees[0]['phone']}, {"_id": 0, "phone": 1})
+    log_target = target_contact['phone'] if target_contact else meeting['title']
+    
+    attendee_info = []
+    for attendee in attendees:
+        if 'phone' in attendee:
+            attendee_info.append(f"{attendee.get('name', 'Unknown')} ({attendee['phone']})")
+        else:
+            attendee_info.append(attendee.get('name', 'Unknown'))
+    attendee_details = ", ".join(attendee_info) if attendee_info else "No attendees"
+    
+    return log_target, attendee_details
+
+def keyset_condition(field: str, value: str, last_id: Optional[str], op: str) -> dict:
+    """Filter for the records after (value, last_id) in a listing sorted by field, then id.
+
+    op is "$lt" for descending sorts and "$gt" for ascending ones; without last_id,
+    records sharing value with the last one seen are skipped.
+    """
+    if last_id:
+        return {"$or": [{field: {op: value}}, {field: value, "id": {op: last_id}}]}
+    return {field: {op: value}}
+
+def list_projection(fields: Optional[str]) -> Dict[str, int]:
+    """find() projection for a comma-separated fields parameter; every field when not given.
+
+    id is always included so results can still be paged by key. The list endpoints
+    return documents without response_model validation, so nothing is filled back in.
+    """
+    projection = {"_id": 0}
+    if not fields:
+        projection["search_keys"] = 0
+    else:
+        for name in fields.split(","):
+            name = name.strip()
+            if name and not name.startswith(("$", "_")):
+                projection[name] = 1
+        projection["id"] = 1
+    return projection
+
+def contact_shop_name(data: Optional[Dict[str, Any]], keys: Tuple[str, ...] = SHOP_NAME_KEYS) -> Optional[str]:
+    """First non-empty shop name in a contact's data, checking keys in order"""
+    if not data:
+        return None
+    return next((data[key] for key in keys if data.get(key)), None)
+
+def followup_contact(contact: Optional[dict]) -> Optional[dict]:
+    """The contact summary stored on follow-ups: only what the follow-up lists render"""
+    if not contact:
+        return None
+    data = contact.get('data') or {}
+    return {
+        "id": contact['id'],
+        "phone": contact.get('phone'),
+        "customer_name": contact.get('customer_name') or data.get('name') or data.get('Name'),
+        "shop_name": contact_shop_name(data),
+        "status": contact.get('status')
+    }
+
+def contact_search_keys(contact: dict) -> List[str]:
+    """Lower-cased words of a contact's CONTACT_SEARCH_FIELDS, stored as search_keys"""
+    words = set()
+    for path in CONTACT_SEARCH_FIELDS:
+        value = contact
+        for part in path.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        if value is not None:
+            words.update(re.findall(r"\w+", str(value).lower()))
+    return sorted(words)
+
+def make_contact_doc(phone: str, customer_name: Optional[str], status: str, data: Dict[str, Any], now: str) -> dict:
+    """Contact document for internal bulk writes, skipping model validation"""
+    doc = {
+        "id": str(uuid.uuid4()),
+        "phone": phone,
+        "customer_name": customer_name,
+        "status": status,
+        "data": data,
+        "created_at": now,
+        "updated_at": now,
+        "last_call_at": None
+    }
+    doc["search_keys"] = contact_search_keys(doc)
+    return doc
+
+async def upsert_import_batch(docs: List[dict], slots: asyncio.Semaphore) -> Tuple[int, int]:
+    """Insert the contacts whose phone isn't taken yet; returns (inserted, already present)
+
+    Upserts on phone with $setOnInsert, so existing contacts are left untouched.
+    """
+    batch_ops = [UpdateOne({"phone": doc["phone"]}, {"$setOnInsert": doc}, upsert=True) for doc in docs]
+    async with slots:
+        try:
+            result = await db.contacts.bulk_write(batch_ops, ordered=False)
+            upserted_indexes = list(result.upserted_ids)
+            matched = result.matched_count
+        except BulkWriteError as e:
+            # Concurrent upserts of the same phone can still collide on the unique index
+            write_errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in write_errors):
+                raise
+            upserted_indexes = [upsert["index"] for upsert in e.details.get("upserted", [])]
+            matched = e.details.get("nMatched", 0) + len(write_errors)
+    await adjust_contact_stats(Counter(docs[index]["status"] for index in upserted_indexes))
+    return len(upserted_indexes), matched
+
+def excel_cell_to_str(value: Any) -> str:
+    """Render a calamine cell the way pandas did with dtype=str"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+NULL_TOKENS = frozenset({"", "nan", "none", "null", "na", "n/a"})
+
+# Lower-cased spreadsheet headers -> CRM field suggested in the import preview
+SUGGESTED_FIELDS = {
+    header: field
+    for headers, field in [
+        (['shop name', 'shopname', 'shop_name', 'business name'], 'shop_name'),
+        (['customer name', 'customername', 'customer_name', 'name', 'client name', 'owner name'], 'customer_name'),
+        (['street', 'address', 'location', 'addr'], 'address'),
+        (['phone number', 'phone_number', 'phone', 'mobile', 'contact', 'contact number'], 'phone'),
+        (['city'], 'city'),
+        (['state'], 'state'),
+        (['status'], 'status'),
+        (['category', 'type', 'classification'], 'category'),
+    ]
+    for header in headers
+}
+
+def iter_openpyxl_rows(path: str):
+    """Stream sheet rows with openpyxl in read-only mode, without building the cell grid"""
+    workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ["" if cell is None else excel_cell_to_str(cell) for cell in row]
+    finally:
+        workbook.close()
+
+def read_excel_rows(path: str):
+    """Stream the first sheet of an Excel file as (header, row iterator)
+
+    Calamine is faster but holds the whole sheet in memory, so very large .xlsx/.xlsm
+    files are streamed row by row with openpyxl's read-only mode instead.
+    """
+    stream_large_file = (
+        Path(path).suffix in (".xlsx", ".xlsm") and os.path.getsize(path) > EXCEL_STREAMING_THRESHOLD_BYTES
+    )
+    if CalamineWorkbook is not None and not stream_large_file:
+        sheet = CalamineWorkbook.from_path(path).get_sheet_by_index(0)
+        # iter_rows() panics on a sheet with no cells, so treat it as having no rows
+        cells = sheet.iter_rows() if sheet.height else iter(())
+        rows = ([excel_cell_to_str(cell) for cell in row] for row in cells)
+    else:
+        rows = iter_openpyxl_rows(path)
+    header = dedupe_header([cell.strip() for cell in next(rows, [])])
+    width = len(header)
+    return header, (row + [""] * (width - len(row)) if len(row) < width else row[:width] for row in rows)
+
+def dedupe_header(names: List[str]) -> List[str]:
+    """Name blank and repeated header cells the way pandas does ("Unnamed: 3", "Phone.1")"""
+    header = []
+    seen = {}
+    for position, name in enumerate(names):
+        name = name or f"Unnamed: {position}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen.setdefault(name, 0)
+        header.append(name)
+    return header
+
+# Leading bytes of the workbook containers: a ZIP archive (.xlsx and friends) or an OLE2 compound file (.xls)
+ZIP_SIGNATURE = b"PK\x03\x04"
+CFB_SIGNATURE = b"\xd0\xcf\x11\xe0"
+ZIP_WORKBOOK_SUFFIXES = frozenset({".xlsx", ".xlsm", ".xlsb", ".ods"})
+
+def spool_upload(upload: UploadFile) -> str:
+    """Copy an upload to a named temp file in chunks and return its path.
+
+    The temp file's suffix follows the file's magic bytes rather than its name, so the
+    reader opens it with the right format first time; anything else is rejected up front.
+    """
+    signature = upload.file.read(len(ZIP_SIGNATURE))
+    upload.file.seek(0)
+    suffix = Path(upload.filename or "").suffix.lower()
+    if signature == ZIP_SIGNATURE:
+        suffix = suffix if suffix in ZIP_WORKBOOK_SUFFIXES else ".xlsx"
+    elif signature == CFB_SIGNATURE:
+        suffix = ".xls"
+    else:
+        raise ValueError("Unsupported file type: upload an Excel workbook (.xlsx or .xls)")
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        shutil.copyfileobj(upload.file, tmp)
+    return tmp.name
+
+def load_import_frame(path: str, mapping: Dict[str, str]):
+    """Parse an import sheet into a cleaned DataFrame of the mapped columns, named by CRM field"""
+    header, rows = read_excel_rows(path)
+    col_index = {}
+    for position, name in enumerate(header):
+        col_index.setdefault(name, position)
+    
+    # Materialize only the mapped columns; unmapped cells are never copied into the frame
+    mapped_fields = [crm_field for crm_field, excel_col in mapping.items() if excel_col in col_index]
+    positions = [col_index[mapping[crm_field]] for crm_field in mapped_fields]
+    df = pd.DataFrame(([row[position] for position in positions] for row in rows), columns=mapped_fields, dtype="string")
+    
+    # Strip every cell and blank out empty placeholders in one vectorized pass
+    df = df.apply(lambda column: column.str.strip())
+    empty_mask = df.isna() | df.apply(lambda column: column.str.lower().isin(NULL_TOKENS))
+    return header, df.mask(empty_mask)
+
+def read_preview_frame(path: str, nrows: int = 5) -> pd.DataFrame:
+    """Read the header and first rows of an Excel file for column mapping"""
+    header, rows = read_excel_rows(path)
+    return pd.DataFrame(list(itertools.islice(rows, nrows)), columns=header, dtype=object)
+
+async def open_smtp(hostname: str, port: int, username: str, password: str) -> aiosmtplib.SMTP:
+    """Open a new SMTP session (STARTTLS + AUTH)"""
+    session = aiosmtplib.SMTP(hostname=hostname, port=port, start_tls=True)
+    await session.connect()
+    try:
+        await session.login(username, password)
+    except aiosmtplib.SMTPException:
+        session.close()
+        raise
+    return session
+
+async def acquire_smtp(hostname: str, port: int, username: str, password: str) -> aiosmtplib.SMTP:
+    """Take a connected session from the idle pool, opening one if none is left"""
+    while smtp_sessions:
+        session = smtp_sessions.pop()
+        if session.is_connected:
+            return session
+    return await open_smtp(hostname, port, username, password)
+
+async def close_smtp():
+    """Close all idle SMTP sessions"""
+    while smtp_sessions:
+        session = smtp_sessions.pop()
+        if session.is_connected:
+            try:
+                await session.quit()
+            except aiosmtplib.SMTPException:
+                session.close()
 
 async def send_email_notification(to_email: str, subject: str, body: str):
     """Send email via SMTP"""
@@ -222,14 +827,20 @@ async def send_email_notification(to_email: str, subject: str, body: str):
         message["Subject"] = subject
         message.set_content(body)
         
-        await aiosmtplib.send(
-            message,
-            hostname=smtp_host,
-            port=smtp_port,
-            username=smtp_user,
-            password=smtp_pass,
-            start_tls=True
-        )
+        # Sessions are reused across sends; each concurrent send holds its own
+        async with smtp_slots:
+            smtp = await acquire_smtp(smtp_host, smtp_port, smtp_user, smtp_pass)
+            try:
+                await smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # The server dropped an idle session; reconnect once and retry
+                smtp.close()
+                smtp = await open_smtp(smtp_host, smtp_port, smtp_user, smtp_pass)
+                await smtp.send_message(message)
+            finally:
+                # Keep the session for later sends while it is still usable
+                if smtp.is_connected:
+                    smtp_sessions.append(smtp)
         logging.info(f"Email sent to {to_email}")
     except Exception as e:
         logging.error(f"Failed to send email: {str(e)}")
@@ -246,7 +857,7 @@ async def signup(user_data: UserSignup):
     # Create user
     user = User(email=user_data.email)
     user_doc = user.model_dump()
-    user_doc['password'] = hash_password(user_data.password)
+    user_doc['password'] = await hash_password(user_data.password)
     
     await db.users.insert_one(user_doc)
     
@@ -267,9 +878,16 @@ async def login(credentials: UserLogin):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Verify password
-    if not verify_password(credentials.password, user['password']):
+    if not await verify_password(credentials.password, user['password']):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
+    # Upgrade bcrypt hashes to argon2id while we have the plaintext
+    if password_needs_rehash(user['password']):
+        await db.users.update_one(
+            {"id": user['id']},
+            {"$set": {"password": await hash_password(credentials.password)}}
+        )
+    
     # Generate token
     token = create_jwt_token(user['id'], user['email'])
     
@@ -294,144 +912,117 @@ async def import_contacts(
     """Import contacts from Excel file with dynamic column mapping"""
     try:
         # Parse column mapping (format: {crm_field: excel_column})
-        import json
-        mapping = json.loads(column_mapping)
+        mapping = orjson.loads(column_mapping)
         
-        # Find which Excel column contains phone numbers and customer name
+        # Find which Excel columns contain phone numbers
         phone_column = mapping.get('phone')
         phone2_column = mapping.get('phone2')
-        customer_name_column = mapping.get('customer_name')
         
-        # Read Excel file
-        contents = await file.read()
+        # Spool the upload to disk and parse it off the event loop so other requests keep being served
+        tmp_path = await asyncio.to_thread(spool_upload, file)
         try:
-            df = pd.read_excel(io.BytesIO(contents), engine='openpyxl', dtype=str, na_filter=False)
-        except:
-            try:
-                df = pd.read_excel(io.BytesIO(contents), engine='xlrd', dtype=str, na_filter=False)
-            except:
-                df = pd.read_excel(io.BytesIO(contents), dtype=str, na_filter=False)
-        
-        # Clean up column names
-        df.columns = df.columns.str.strip()
+            header, df = await asyncio.to_thread(load_import_frame, tmp_path, mapping)
+        finally:
+            os.unlink(tmp_path)
+        mapped_fields = list(df.columns)
         
         # Debug
-        print(f"\n=== IMPORT DEBUG ===")
-        print(f"Excel columns: {list(df.columns)}")
-        print(f"Mapping: {mapping}")
-        print(f"Phone column: {phone_column}")
-        print(f"Phone 2 column: {phone2_column}")
-        print(f"Total rows in Excel: {len(df)}")
-        
-        # Replace empty values
-        df = df.replace(["", " ", "N/A", "n/a", "NA", "na", "NULL", "null", "None", "none"], pd.NA)
-        
-        # Remove duplicates based on phone columns
-        duplicate_columns = []
-        if phone_column and phone_column in df.columns:
-            duplicate_columns.append(phone_column)
+        logger.debug(
+            "Import columns=%s mapping=%s phone_column=%s phone2_column=%s",
+            header, mapping, phone_column, phone2_column
+        )
         
         original_count = len(df)
-        if duplicate_columns:
-            df = df.drop_duplicates(subset=duplicate_columns, keep="first")
-            file_duplicates_removed = original_count - len(df)
-            print(f"Removed {file_duplicates_removed} duplicate rows from Excel file")
-        else:
-            file_duplicates_removed = 0
+        
+        # Remove duplicates based on the (already stripped) phone column; rows without a phone are kept
+        file_duplicates_removed = 0
+        if 'phone' in df.columns:
+            duplicate_mask = df['phone'].duplicated(keep='first') & df['phone'].notna()
+            file_duplicates_removed = int(duplicate_mask.sum())
+            df = df[~duplicate_mask].reset_index(drop=True)
         
         imported_count = 0
         skipped_count = 0
         db_duplicates_count = 0  # Track database duplicates separately
         empty_data_count = 0     # Track empty data skips
         processed_count = 0      # Track total processed
+        candidates = []          # (phone, customer_name, status, contact_data) per processed row
+        
+        # Rows where every mapped cell is empty (e.g. trailing blank rows) carry no contact data
+        empty_rows = df.isna().all(axis=1).to_numpy()
+        
+        # Generate a phone for rows without one, from the shop name or a running row number
+        row_numbers = pd.Series(range(1, len(df) + 1), index=df.index).astype("string")
+        fallback_phones = "contact_" + row_numbers
+        if 'shop_name' in df.columns:
+            clean_shops = df['shop_name'].str.replace(r"[ -]", "_", regex=True).str.slice(0, 15)
+            fallback_phones = (clean_shops + "_" + row_numbers).fillna(fallback_phones)
+        phones = df['phone'].fillna(fallback_phones) if 'phone' in df.columns else fallback_phones
         
-        for index, row in df.iterrows():
+        # Resolve column positions once and walk plain object rows instead of building dicts per row
+        customer_name_idx = mapped_fields.index('customer_name') if 'customer_name' in mapped_fields else -1
+        status_idx = mapped_fields.index('status') if 'status' in mapped_fields else -1
+        data_fields = tuple(
+            (position, field) for position, field in enumerate(mapped_fields)
+            if field not in ('phone', 'customer_name', 'status')
+        )
+        
+        for row, phone, row_is_empty in zip(df.to_numpy(dtype=object, na_value=None), phones.to_numpy(dtype=object), empty_rows):
             processed_count += 1
-            contact_data = {}
-            
-            # Process all mapped fields except phone and customer_name fields
-            for crm_field, excel_col in mapping.items():
-                if excel_col in df.columns and crm_field not in ['phone', 'phone2', 'customer_name']:
-                    value = row[excel_col]
-                    if pd.isna(value) or value is None:
-                        continue
-                    str_value = str(value).strip()
-                    if str_value == "" or str_value.lower() in ["nan", "none", "null", "na", "n/a"]:
-                        continue
-                    try:
-                        contact_data[crm_field] = str_value.encode("utf-8", errors="ignore").decode("utf-8")
-                    except:
-                        contact_data[crm_field] = str_value
-            
-            # Get primary phone number
-            phone = None
-            if phone_column and phone_column in df.columns:
-                phone_value = row[phone_column]
-                if pd.notna(phone_value):
-                    phone = str(phone_value).strip()
-            
-            # Get customer name
-            customer_name = None
-            if customer_name_column and customer_name_column in df.columns:
-                customer_name_value = row[customer_name_column]
-                if pd.notna(customer_name_value):
-                    customer_name = str(customer_name_value).strip()
+            if row_is_empty:
+                empty_data_count += 1
+                skipped_count += 1
+                continue
             
-            # Get secondary phone number
-            if phone2_column and phone2_column in df.columns:
-                phone2_value = row[phone2_column]
-                if pd.notna(phone2_value):
-                    phone2 = str(phone2_value).strip()
-                    contact_data['phone2'] = phone2
+            contact_data = {}
             
-            # Generate phone if not available
-            if not phone:
-                shop_name = contact_data.get("shop_name")
-                if shop_name and shop_name.strip():
-                    clean_shop = shop_name.replace(" ", "_").replace("-", "_")[:15]
-                    phone = f"{clean_shop}_{processed_count}"
-                else:
-                    phone = f"contact_{processed_count}"
+            # Process all mapped fields except phone, customer_name and status (phone2 stays in data)
+            for position, crm_field in data_fields:
+                value = row[position]
+                if value is not None:
+                    contact_data[crm_field] = value
             
-            # Check for duplicates in database
-            existing = await db.contacts.find_one({"phone": phone})
-            if existing:
-                db_duplicates_count += 1
-                skipped_count += 1
-                continue
+            customer_name = row[customer_name_idx] if customer_name_idx >= 0 else None
+            status = row[status_idx] if status_idx >= 0 else None
             
+            candidates.append((phone, customer_name, status, contact_data))
+        
+        # Build Contact-shaped documents directly; every field is already a cleaned string
+        now = utc_now_iso()
+        new_docs = []
+        for phone, customer_name, status, contact_data in candidates:
             # Skip if no meaningful contact data
-            if not contact_data:
+            if not contact_data and status is None:
                 empty_data_count += 1
                 skipped_count += 1
                 continue
             
-            # Handle status
-            status = contact_data.pop("status", "None")
-            
-            contact = Contact(
-                phone=phone,
-                customer_name=customer_name,
-                status=status,
-                data=contact_data
-            )
-            
-            await db.contacts.insert_one(contact.model_dump())
-            imported_count += 1
+            new_docs.append(make_contact_doc(
+                phone, customer_name, status if status is not None else "None", contact_data, now
+            ))
+        
+        # Upsert on phone in unordered batches, several in flight at once: phones are unique within
+        # the file by now, so batches never touch the same contact. Existing contacts count as duplicates.
+        write_slots = asyncio.Semaphore(IMPORT_WRITE_CONCURRENCY)
+        batch_results = await asyncio.gather(*(
+            upsert_import_batch(new_docs[start:start + IMPORT_BATCH_SIZE], write_slots)
+            for start in range(0, len(new_docs), IMPORT_BATCH_SIZE)
+        ))
+        for inserted, matched in batch_results:
+            imported_count += inserted
+            db_duplicates_count += matched
+            skipped_count += matched
         
         # Calculate totals
         total_processed = processed_count
         
-        print(f"=== IMPORT SUMMARY ===")
-        print(f"Total rows in Excel: {original_count}")
-        print(f"File duplicates removed: {file_duplicates_removed}")
-        print(f"Rows processed: {processed_count}")
-        print(f"Successfully imported: {imported_count}")
-        print(f"Database duplicates: {db_duplicates_count}")
-        print(f"Empty data skipped: {empty_data_count}")
-        print(f"Total skipped: {skipped_count}")
+        logger.info(
+            "Import summary: rows=%d file_duplicates=%d processed=%d imported=%d db_duplicates=%d empty=%d skipped=%d",
+            original_count, file_duplicates_removed, processed_count, imported_count,
+            db_duplicates_count, empty_data_count, skipped_count
+        )
         
-        await log_activity(
+        log_activity(
             current_user["id"],
             current_user["email"],
             "Imported contacts",
@@ -450,7 +1041,7 @@ async def import_contacts(
         }
     
     except Exception as e:
-        print(f"Import error: {str(e)}")
+        logger.exception("Import error")
         raise HTTPException(status_code=400, detail=str(e))
 
 @api_router.post("/contacts/preview")
@@ -460,48 +1051,22 @@ async def preview_excel(
 ):
     """Preview Excel file columns for mapping"""
     try:
-        contents = await file.read()
-        # Read with proper encoding and data handling
+        # Stream the upload to disk and read only the first rows, off the event loop
+        tmp_path = await asyncio.to_thread(spool_upload, file)
         try:
-            df = pd.read_excel(io.BytesIO(contents), nrows=5, engine='openpyxl', dtype=str, na_filter=False)
-        except:
-            try:
-                df = pd.read_excel(io.BytesIO(contents), nrows=5, engine='xlrd', dtype=str, na_filter=False)
-            except:
-                df = pd.read_excel(io.BytesIO(contents), nrows=5, dtype=str, na_filter=False)
-        
-        # Clean up column names
-        df.columns = df.columns.str.strip()
+            df = await asyncio.to_thread(read_preview_frame, tmp_path)
+        finally:
+            os.unlink(tmp_path)
         
         # Clean up data for preview
-        df = df.replace(['', ' ', 'N/A', 'n/a', 'NA', 'na', 'NULL', 'null', 'None', 'none'], None)
+        df = df.mask(df.apply(lambda column: column.str.strip().str.lower().isin(NULL_TOKENS)), None)
         
         # Replace NaN values with None for JSON serialization
         df = df.replace({pd.NA: None, pd.NaT: None})
         df = df.where(pd.notna(df), None)
         
         # Create better mapping suggestions based on common column names
-        suggested_mapping = {}
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if col_lower in ['shop name', 'shopname', 'shop_name', 'business name']:
-                suggested_mapping[col] = 'shop_name'
-            elif col_lower in ['customer name', 'customername', 'customer_name', 'name', 'client name', 'owner name']:
-                suggested_mapping[col] = 'customer_name'
-            elif col_lower in ['street', 'address', 'location', 'addr']:
-                suggested_mapping[col] = 'address'
-            elif col_lower in ['phone number', 'phone_number', 'phone', 'mobile', 'contact', 'contact number']:
-                suggested_mapping[col] = 'phone'
-            elif col_lower == 'city':
-                suggested_mapping[col] = 'city'
-            elif col_lower == 'state':
-                suggested_mapping[col] = 'state'
-            elif col_lower == 'status':
-                suggested_mapping[col] = 'status'
-            elif col_lower in ['category', 'type', 'classification']:
-                suggested_mapping[col] = 'category'
-            else:
-                suggested_mapping[col] = ''
+        suggested_mapping = {col: SUGGESTED_FIELDS.get(col.lower().strip(), '') for col in df.columns}
         
         return {
             "columns": df.columns.tolist(),
@@ -517,54 +1082,50 @@ async def get_contacts(
     limit: int = 100,
     search: Optional[str] = None,
     status: Optional[str] = None,
+    before: Optional[str] = None,
+    before_id: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
+    """List contacts newest first.
+
+    Pass the created_at (and id) of the last contact seen as before/before_id
+    to page by key instead of skip, which stays fast at any depth. fields
+    (e.g. "phone,status,created_at") limits the returned fields.
+    """
     query = {}
     
     if search:
-        # Log the search query for debugging
-        print(f"Searching for: {search}")
+        logger.debug("Searching contacts for %r", search)
         
-        # Build a comprehensive search query
-        search_conditions = [
-            {"phone": {"$regex": search, "$options": "i"}},
-            {"customer_name": {"$regex": search, "$options": "i"}},
-        ]
-        
-        # Search in all possible nested data field variations
-        data_fields = [
-            # Shop names - most common variations
-            "shop_name", "Shop_Name", "Shop Name", "shopName", "SHOP_NAME",
-            "business_name", "Business_Name", "Business Name", "businessName", "BUSINESS_NAME",
-            "shop", "Shop", "SHOP", "store_name", "Store_Name", "Store Name", "storeName",
-            # Customer/Owner names  
-            "name", "Name", "NAME", "customer_name", "Customer_Name", "Customer Name", "customerName",
-            "owner_name", "Owner_Name", "Owner Name", "ownerName", "OWNER_NAME",
-            "contact_person", "Contact_Person", "Contact Person", "contactPerson",
-            # Addresses
-            "address", "Address", "ADDRESS", "full_address", "Full_Address", "Full Address", "fullAddress",
-            "city", "City", "CITY", "state", "State", "STATE", "location", "Location", "LOCATION",
-            # Other common fields
-            "company", "Company", "COMPANY", "firm", "Firm", "FIRM",
-            "organization", "Organization", "ORGANIZATION", "title", "Title", "TITLE"
-        ]
-        
-        # Add searches for all possible data field variations
-        for field in data_fields:
-            search_conditions.append({f"data.{field}": {"$regex": search, "$options": "i"}})
-        
-        query["$or"] = search_conditions
+        term = search.strip()
+        digits = term.lstrip('+')
+        if digits.isdigit():
+            # Phone numbers: anchored prefixes, with and without a leading +, can use the phone index
+            query["phone"] = {"$in": [re.compile(f"^{digits}"), re.compile(f"^\\+{digits}")]}
+        elif term:
+            # Every word must start some search key: anchored prefixes the search_keys index can
+            # serve, so partial words typed into the search box still match ("joh" finds John)
+            words = re.findall(r"\w+", term.lower())
+            query["search_keys"] = {"$all": [re.compile(f"^{re.escape(word)}") for word in words]}
     
     if status:
         query["status"] = status
     
+    sort = [("created_at", -1), ("id", -1)]
+    if before:
+        # Keyset page: id breaks ties between contacts created in the same import
+        query.update(keyset_condition("created_at", before, before_id, "$lt"))
+        skip = 0
+    
     try:
-        print(f"MongoDB query: {query}")  # Debug log
-        contacts = await db.contacts.find(query, {"_id": 0}).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-        print(f"Found {len(contacts)} contacts")  # Debug log
-        return contacts
+        logger.debug("Contact query: %s", query)
+        contacts = await db.contacts.find(query, list_projection(fields)).sort(sort).skip(skip).limit(limit).to_list(limit)
+        logger.debug("Found %d contacts", len(contacts))
+        # Stored documents are returned as-is; response_model only documents the shape
+        return ORJSONResponse(contacts)
     except Exception as e:
-        print(f"Error in get_contacts: {str(e)}")  # Debug log
+        logger.exception("Error in get_contacts")
         raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
 @api_router.get("/contacts/debug-data")
@@ -594,43 +1155,36 @@ async def test_search_no_auth():
 
 @api_router.get("/contacts/count")
 async def get_contacts_count(current_user: dict = Depends(get_current_user)):
-    total = await db.contacts.count_documents({})
-    by_status = await db.contacts.aggregate([
-        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
-    ]).to_list(None)
-    
-    return {
-        "total": total,
-        "by_status": {item['_id']: item['count'] for item in by_status}
-    }
+    # Counts are maintained by the contact write paths, so this reads a handful of small documents
+    status_counts = await db.contact_status_counts.find({"count": {"$gt": 0}}).to_list(None)
+    by_status = {item['_id']: item['count'] for item in status_counts}
+    return {"total": sum(by_status.values()), "by_status": by_status}
 
 @api_router.post("/contacts", response_model=Contact)
 async def create_contact(
     contact_data: ContactCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    # Check for duplicate
-    existing = await db.contacts.find_one({"phone": contact_data.phone})
-    if existing:
-        raise HTTPException(status_code=400, detail="Contact with this phone number already exists")
-    
     contact = Contact(**contact_data.model_dump())
-    await db.contacts.insert_one(contact.model_dump())
+    # The unique phone index rejects duplicates, so no lookup is needed first
+    try:
+        contact_doc = contact.model_dump()
+        await db.contacts.insert_one({**contact_doc, "search_keys": contact_search_keys(contact_doc)})
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Contact with this phone number already exists")
+    await adjust_contact_stats({contact.status: 1})
     
     # Get shop name and customer name for logging
     contact_data = contact.data if hasattr(contact, 'data') else {}
-    shop_name = (
-        contact_data.get('shop_name') or 
-        contact_data.get('Shop_Name') or 
-        contact_data.get('Shop Name') or
-        contact_data.get('shop') or
-        contact_data.get('Shop') or
-        'Unknown Shop'
-    )
+    shop_name = contact_shop_name(contact_data, SHOP_NAME_KEYS + ('shop', 'Shop')) or 'Unknown Shop'
     customer_name = getattr(contact, 'customer_name', None) or 'Unknown Customer'
-    print(f"Contact creation - Phone: {contact.phone}, Customer: {customer_name}, Shop name: {shop_name}, Contact data keys: {list(contact_data.keys())}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Contact creation - Phone: %s, Customer: %s, Shop name: %s, Contact data keys: %s",
+            contact.phone, customer_name, shop_name, list(contact_data.keys())
+        )
     
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Created contact",
@@ -645,7 +1199,7 @@ async def get_contact(
     contact_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    contact = await db.contacts.find_one({"id": contact_id}, {"_id": 0})
+    contact = await load_contact(contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     return contact
@@ -656,21 +1210,30 @@ async def update_contact(
     updates: ContactUpdate,
     current_user: dict = Depends(get_current_user)
 ):
-    contact = await db.contacts.find_one({"id": contact_id}, {"_id": 0})
-    if not contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    
     update_data = {k: v for k, v in updates.model_dump().items() if v is not None}
-    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    update_data['updated_at'] = utc_now_iso()
     
-    await db.contacts.update_one({"id": contact_id}, {"$set": update_data})
+    # The write returns the document it replaced, so concurrent updates adjust the counts from
+    # the status each one actually replaced; the unique phone index rejects a phone in use
+    try:
+        contact = await db.contacts.find_one_and_update(
+            {"id": contact_id},
+            {"$set": update_data},
+            projection={"_id": 0, "status": 1, **CONTACT_LOG_FIELDS},
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Contact with this phone number already exists")
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    if update_data.get('status', contact.get('status')) != contact.get('status'):
+        await adjust_contact_stats({contact.get('status'): -1, update_data['status']: 1})
+    await invalidate_contacts(contact_id)
     
     # Get shop name and customer name for logging (check both original and updated data)
     shop_name = (
         update_data.get('data', {}).get('shop_name') or 
-        contact.get('data', {}).get('shop_name') or 
-        contact.get('data', {}).get('Shop_Name') or 
-        contact.get('data', {}).get('Shop Name') or 
+        contact_shop_name(contact.get('data')) or 
         'Unknown Shop'
     )
     customer_name = (
@@ -679,7 +1242,7 @@ async def update_contact(
         'Unknown Customer'
     )
     
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Updated contact",
@@ -687,7 +1250,13 @@ async def update_contact(
         details=f"Customer: {customer_name}, Shop: {shop_name}, Fields: {', '.join(update_data.keys())}"
     )
     
-    updated_contact = await db.contacts.find_one({"id": contact_id}, {"_id": 0})
+    updated_contact = await load_contact(contact_id)
+    if update_data.keys() & {"phone", "customer_name", "data"}:
+        await db.contacts.update_one(
+            {"id": contact_id}, {"$set": {"search_keys": contact_search_keys(updated_contact)}}
+        )
+    await db.followups.update_many({"contact_id": contact_id}, {"$set": {"contact": followup_contact(updated_contact)}})
+    await bump_cache_generation("followups")
     return updated_contact
 
 @api_router.delete("/contacts/{contact_id}")
@@ -695,28 +1264,31 @@ async def delete_contact(
     contact_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    contact = await db.contacts.find_one({"id": contact_id}, {"_id": 0})
+    # The deleted document itself drives the count adjustment and the log entry
+    contact = await db.contacts.find_one_and_delete({"id": contact_id}, projection={"_id": 0})
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
+    await adjust_contact_stats({contact.get('status'): -1})
+    await invalidate_contacts(contact_id)
     
-    # Get shop name and customer name before deletion for logging
+    # Get shop name and customer name for logging
     contact_data = contact.get('data', {})
     shop_name = (
-        contact_data.get('shop_name') or 
-        contact_data.get('Shop_Name') or 
-        contact_data.get('Shop Name') or
-        contact_data.get('shop') or
-        contact_data.get('Shop') or
-        contact.get('shop_name') or  # In case it's directly on contact
-        contact.get('Shop_Name') or
+        contact_shop_name(contact_data, SHOP_NAME_KEYS + ('shop', 'Shop')) or
+        contact_shop_name(contact, ('shop_name', 'Shop_Name')) or  # In case it's directly on contact
         'Unknown Shop'
     )
     customer_name = contact.get('customer_name') or 'Unknown Customer'
-    print(f"Contact deletion - Phone: {contact.get('phone')}, Customer: {customer_name}, Shop name: {shop_name}, Contact data keys: {list(contact_data.keys())}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Contact deletion - Phone: %s, Customer: %s, Shop name: %s, Contact data keys: %s",
+            contact.get('phone'), customer_name, shop_name, list(contact_data.keys())
+        )
     
-    await db.contacts.delete_one({"id": contact_id})
+    await db.followups.update_many({"contact_id": contact_id}, {"$set": {"contact": None}})
+    await bump_cache_generation("followups")
     
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Deleted contact",
@@ -732,17 +1304,14 @@ async def log_call(
     current_user: dict = Depends(get_current_user)
 ):
     """Log a call to a contact"""
-    contact = await db.contacts.find_one({"id": contact_id}, {"_id": 0})
+    contact = await load_contact(contact_id, CONTACT_LOG_FIELDS)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     
-    call_time = datetime.now(timezone.utc).isoformat()
-    await db.contacts.update_one(
-        {"id": contact_id},
-        {"$set": {"last_call_at": call_time}}
-    )
+    call_time = utc_now_iso()
+    queue_contact_update(contact_id, {"last_call_at": call_time})
     
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Called contact",
@@ -759,14 +1328,19 @@ async def create_note(
     note_data: NoteCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    note = Note(
-        user_id=current_user['id'],
-        **note_data.model_dump()
-    )
-    await db.notes.insert_one(note.model_dump())
+    # NoteCreate already validated the input, so the stored note is built as a plain dict
+    note = {
+        "id": str(uuid.uuid4()),
+        "contact_id": note_data.contact_id,
+        "user_id": current_user['id'],
+        "content": note_data.content,
+        "created_at": utc_now_iso()
+    }
+    await db.notes.insert_one(note)
+    note.pop("_id", None)
     
-    contact = await db.contacts.find_one({"id": note_data.contact_id}, {"_id": 0})
-    await log_activity(
+    contact = await load_contact(note_data.contact_id, CONTACT_LOG_FIELDS)
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Added note",
@@ -781,7 +1355,7 @@ async def get_contact_notes(
     current_user: dict = Depends(get_current_user)
 ):
     notes = await db.notes.find({"contact_id": contact_id}, {"_id": 0}).sort("created_at", -1).to_list(None)
-    return notes
+    return ORJSONResponse(notes)
 
 # ============ FOLLOW-UP ROUTES ============
 
@@ -795,15 +1369,18 @@ async def create_followup(
         user_email=current_user['email'],
         **followup_data.model_dump()
     )
-    await db.followups.insert_one(followup.model_dump())
+    contact = await load_contact(followup_data.contact_id)
+    
+    # Store a contact summary with the follow-up so the follow-up lists need no join
+    await db.followups.insert_one({**followup.model_dump(), "contact": followup_contact(contact)})
+    await bump_cache_generation("followups")
     
-    contact = await db.contacts.find_one({"id": followup_data.contact_id}, {"_id": 0})
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Created follow-up",
         target=contact['phone'] if contact else followup_data.contact_id,
-        details=f"Scheduled for {followup_data.follow_up_date}"
+        details=f"Scheduled for {followup_data.follow_up_date.isoformat()}"
     )
     
     return followup
@@ -817,85 +1394,54 @@ async def get_followups(
     if status:
         query["status"] = status
     
-    followups = await db.followups.find(query, {"_id": 0}).sort("follow_up_date", 1).to_list(None)
-    return followups
+    # The stored contact copies are not part of the FollowUp response
+    followups = await db.followups.find(query, {"_id": 0, "contact": 0}).sort("follow_up_date", 1).to_list(None)
+    return ORJSONResponse(followups)
 
 @api_router.get("/followups/upcoming")
+@cached_response("followups", before=mark_followups_overdue)
 async def get_upcoming_followups(
     current_user: dict = Depends(get_current_user)
 ):
     """Get follow-ups that are due soon or overdue with contact details"""
-    now = datetime.now(timezone.utc).isoformat()
-    
-    followups = await db.followups.find(
-        {"status": {"$in": ["pending", "overdue"]}},
-        {"_id": 0}
-    ).sort("follow_up_date", 1).to_list(None)
-    
-    upcoming = []
-    overdue = []
-    
-    for followup in followups:
-        # Get contact details
-        contact = await db.contacts.find_one({"id": followup['contact_id']}, {"_id": 0})
-        if contact:
-            followup['contact'] = contact
-        
-        if followup['follow_up_date'] < now:
-            if followup['status'] != 'overdue':
-                followup['status'] = 'overdue'
-                await db.followups.update_one({"id": followup['id']}, {"$set": {"status": "overdue"}})
-            overdue.append(followup)
-        else:
-            upcoming.append(followup)
+    now = utc_now()
+    
+    # Overdue and upcoming as two concurrent queries rather than one $facet: a facet's output is a
+    # single document (16 MB cap), and the overdue list is unbounded
+    base_match = {"status": {"$in": ["pending", "overdue"]}}
+    overdue, upcoming = await asyncio.gather(
+        db.followups.find({**base_match, "follow_up_date": {"$lt": now}}, {"_id": 0})
+            .sort("follow_up_date", 1).to_list(None),
+        db.followups.find({**base_match, "follow_up_date": {"$gte": now}}, {"_id": 0})
+            .sort("follow_up_date", 1).limit(20).to_list(None)
+    )
+    await attach_followup_contacts(overdue + upcoming)
     
     return {
         "overdue": overdue,
-        "upcoming": upcoming[:20]
+        "upcoming": upcoming
     }
 
 @api_router.get("/followups/by-date")
+@cached_response("followups")
 async def get_followups_by_date(
     date_filter: str,  # today, tomorrow, this_week, all
     current_user: dict = Depends(get_current_user)
 ):
     """Get follow-ups filtered by date range"""
-    now = datetime.now(timezone.utc)
-    
-    # Calculate date range based on filter
-    if date_filter == "today":
-        start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-    elif date_filter == "tomorrow":
-        tomorrow = now + timedelta(days=1)
-        start_date = tomorrow.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = tomorrow.replace(hour=23, minute=59, second=59, microsecond=999999)
-    elif date_filter == "this_week":
-        # Start from today
-        start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        # End 7 days from now
-        end_date = (now + timedelta(days=7)).replace(hour=23, minute=59, second=59, microsecond=999999)
-    else:  # all
-        start_date = None
-        end_date = None
+    now = utc_now()
     
     # Build query
     query = {"status": {"$in": ["pending", "overdue"]}}
-    if start_date and end_date:
-        query["follow_up_date"] = {
-            "$gte": start_date.isoformat(),
-            "$lte": end_date.isoformat()
-        }
+    date_range = followup_date_range(date_filter, now.date())
+    if date_range:
+        query["follow_up_date"] = date_range
     
     followups = await db.followups.find(query, {"_id": 0}).sort("follow_up_date", 1).to_list(None)
     
-    # Add contact details to each follow-up
-    result = []
-    for followup in followups:
-        contact = await db.contacts.find_one({"id": followup['contact_id']}, {"_id": 0})
-        if contact:
-            followup['contact'] = contact
-            result.append(followup)
+    # Only follow-ups whose contact still exists are listed
+    await attach_followup_contacts(followups)
+    result = [followup for followup in followups if 'contact' in followup]
     
     return {
         "filter": date_filter,
@@ -908,17 +1454,25 @@ async def complete_followup(
     followup_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    followup = await db.followups.find_one({"id": followup_id}, {"_id": 0})
+    # Read and update in one round trip
+    followup = await db.followups.find_one_and_update(
+        {"id": followup_id},
+        {"$set": {"status": "completed"}},
+        projection={"_id": 0, "contact_id": 1, "contact.phone": 1}
+    )
     if not followup:
         raise HTTPException(status_code=404, detail="Follow-up not found")
+    await bump_cache_generation("followups")
     
-    # Get the contact to use phone number as target for better activity log display
-    contact = await db.contacts.find_one({"id": followup['contact_id']}, {"_id": 0})
+    # Use the contact's phone number as target for better activity log display
+    if 'contact' in followup:
+        contact = followup['contact']
+    else:
+        # Follow-up created before contacts were stored on it
+        contact = await load_contact(followup['contact_id'], CONTACT_LOG_FIELDS)
     target = contact['phone'] if contact else followup['contact_id']
     
-    await db.followups.update_one({"id": followup_id}, {"$set": {"status": "completed"}})
-    
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Completed follow-up",
@@ -928,54 +1482,38 @@ async def complete_followup(
     return {"message": "Follow-up marked as completed"}
 
 @api_router.get("/followups/paginated")
+@cached_response("followups", before=mark_followups_overdue)
 async def get_paginated_followups(
     skip: int = 0,
     limit: int = 20,
     date_filter: str = "all",
+    after: Optional[datetime] = None,
+    after_id: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get paginated follow-ups"""
-    now = datetime.now(timezone.utc)
+    """Get paginated follow-ups.
+
+    Pass the follow_up_date and id of the last follow-up seen as after/after_id
+    to page by key instead of skip.
+    """
+    now = utc_now()
     
     # Calculate date range based on filter
     query = {"status": {"$in": ["pending", "overdue"]}}
-    if date_filter == "today":
-        start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        query["follow_up_date"] = {
-            "$gte": start_date.isoformat(),
-            "$lte": end_date.isoformat()
-        }
-    elif date_filter == "tomorrow":
-        tomorrow = now + timedelta(days=1)
-        start_date = tomorrow.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = tomorrow.replace(hour=23, minute=59, second=59, microsecond=999999)
-        query["follow_up_date"] = {
-            "$gte": start_date.isoformat(),
-            "$lte": end_date.isoformat()
-        }
-    elif date_filter == "this_week":
-        start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = (now + timedelta(days=7)).replace(hour=23, minute=59, second=59, microsecond=999999)
-        query["follow_up_date"] = {
-            "$gte": start_date.isoformat(),
-            "$lte": end_date.isoformat()
-        }
+    date_range = followup_date_range(date_filter, now.date())
+    if date_range:
+        query["follow_up_date"] = date_range
     
-    followups = await db.followups.find(query, {"_id": 0}).sort("follow_up_date", 1).skip(skip).limit(limit).to_list(limit)
+    if after:
+        # Combined with $and so the date_filter range on follow_up_date still applies
+        query["$and"] = [keyset_condition("follow_up_date", after, after_id, "$gt")]
+        skip = 0
     
-    # Add contact details to each follow-up
-    result = []
-    for followup in followups:
-        # Update status if overdue
-        if followup['follow_up_date'] < now.isoformat() and followup['status'] != 'overdue':
-            followup['status'] = 'overdue'
-            await db.followups.update_one({"id": followup['id']}, {"$set": {"status": "overdue"}})
-        
-        contact = await db.contacts.find_one({"id": followup['contact_id']}, {"_id": 0})
-        if contact:
-            followup['contact'] = contact
-            result.append(followup)
+    followups = await db.followups.find(query, {"_id": 0}).sort([("follow_up_date", 1), ("id", 1)]).skip(skip).limit(limit).to_list(limit)
+    
+    # Only follow-ups whose contact still exists are listed
+    await attach_followup_contacts(followups)
+    result = [followup for followup in followups if 'contact' in followup]
     
     return result
 
@@ -985,10 +1523,22 @@ async def get_paginated_followups(
 async def get_activity_logs(
     skip: int = 0,
     limit: int = 100,
+    before: Optional[str] = None,
+    before_id: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    logs = await db.activity_logs.find({}, {"_id": 0}).sort("timestamp", -1).skip(skip).limit(limit).to_list(limit)
-    return logs
+    """List activity newest first; before/before_id (timestamp and id of the last log seen) page by key instead of skip.
+
+    fields (e.g. "action,target,timestamp") limits the returned fields.
+    """
+    query = {}
+    if before:
+        query = keyset_condition("timestamp", before, before_id, "$lt")
+        skip = 0
+    
+    logs = await db.activity_logs.find(query, list_projection(fields)).sort([("timestamp", -1), ("id", -1)]).skip(skip).limit(limit).to_list(limit)
+    return ORJSONResponse(logs)
 
 # ============ MEETING ROUTES ============
 
@@ -1002,30 +1552,14 @@ async def create_meeting(
         user_email=current_user['email'],
         **meeting_data.model_dump()
     )
-    await db.meetings.insert_one(meeting.model_dump())
-    
-    # Get contact details for proper logging
-    target_contact = None
-    if meeting.attendees and len(meeting.attendees) > 0:
-        # Find the first attendee's contact for logging
-        first_attendee = meeting.attendees[0]
-        if 'phone' in first_attendee:
-            target_contact = await db.contacts.find_one({"phone": first_attendee['phone']}, {"_id": 0})
-    
-    # Use contact phone as target, fallback to meeting title
-    log_target = target_contact['phone'] if target_contact else meeting.title
-    
-    # Create detailed attendee info for better logging
-    attendee_info = []
-    for attendee in meeting.attendees:
-        if 'phone' in attendee:
-            attendee_info.append(f"{attendee.get('name', 'Unknown')} ({attendee['phone']})")
-        else:
-            attendee_info.append(attendee.get('name', 'Unknown'))
-    
-    attendee_details = ", ".join(attendee_info) if attendee_info else "No attendees"
+    meeting_doc = meeting.model_dump()
+    # Build the logging context while the insert runs
+    _, (log_target, attendee_details) = await asyncio.gather(
+        db.meetings.insert_one(meeting_doc),
+        meeting_log_context(meeting_doc)
+    )
     
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Created meeting",
@@ -1047,7 +1581,7 @@ async def get_meetings(
         query["status"] = status
     
     meetings = await db.meetings.find(query, {"_id": 0}).sort("date", 1).skip(skip).limit(limit).to_list(limit)
-    return meetings
+    return ORJSONResponse(meetings)
 
 @api_router.get("/meetings/{meeting_id}", response_model=Meeting)
 async def get_meeting(
@@ -1087,28 +1621,11 @@ async def update_meeting(
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    await db.meetings.update_one({"id": meeting_id}, {"$set": update_data})
-    
-    # Get contact details for proper logging
-    target_contact = None
-    if meeting.get('attendees') and len(meeting['attendees']) > 0:
-        first_attendee = meeting['attendees'][0]
-        if 'phone' in first_attendee:
-            target_contact = await db.contacts.find_one({"phone": first_attendee['phone']}, {"_id": 0})
-    
-    # Use contact phone as target, fallback to meeting title
-    log_target = target_contact['phone'] if target_contact else meeting['title']
-    
-    # Create detailed attendee info for better logging
-    attendee_info = []
-    if meeting.get('attendees'):
-        for attendee in meeting['attendees']:
-            if 'phone' in attendee:
-                attendee_info.append(f"{attendee.get('name', 'Unknown')} ({attendee['phone']})")
-            else:
-                attendee_info.append(attendee.get('name', 'Unknown'))
-    
-    attendee_details = ", ".join(attendee_info) if attendee_info else "No attendees"
+    # Build the logging context alongside the update
+    _, (log_target, attendee_details) = await asyncio.gather(
+        db.meetings.update_one({"id": meeting_id}, {"$set": update_data}),
+        meeting_log_context(meeting)
+    )
     
     # Determine action for logging
     action = "Updated meeting"
@@ -1123,7 +1640,7 @@ async def update_meeting(
         action = f"Updated meeting status to {update_data['status']}"
         details = f"Meeting: {meeting['title']}, Status: {update_data['status']}, Attendees: {attendee_details}"
     
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         action,
@@ -1146,17 +1663,11 @@ async def update_meeting_status(
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    await db.meetings.update_one({"id": meeting_id}, {"$set": {"status": status_update.status}})
-    
-    # Get contact details for proper logging
-    target_contact = None
-    if meeting.get('attendees') and len(meeting['attendees']) > 0:
-        first_attendee = meeting['attendees'][0]
-        if 'phone' in first_attendee:
-            target_contact = await db.contacts.find_one({"phone": first_attendee['phone']}, {"_id": 0})
-    
-    # Use contact phone as target, fallback to meeting title
-    log_target = target_contact['phone'] if target_contact else meeting['title']
+    # Build the logging context alongside the update
+    _, (log_target, attendee_details) = await asyncio.gather(
+        db.meetings.update_one({"id": meeting_id}, {"$set": {"status": status_update.status}}),
+        meeting_log_context(meeting)
+    )
     
     # Determine action based on status
     if status_update.status == "completed":
@@ -1166,18 +1677,7 @@ async def update_meeting_status(
     else:
         action = f"Updated meeting status to {status_update.status}"
     
-    # Create detailed attendee info for better logging
-    attendee_info = []
-    if meeting.get('attendees'):
-        for attendee in meeting['attendees']:
-            if 'phone' in attendee:
-                attendee_info.append(f"{attendee.get('name', 'Unknown')} ({attendee['phone']})")
-            else:
-                attendee_info.append(attendee.get('name', 'Unknown'))
-    
-    attendee_details = ", ".join(attendee_info) if attendee_info else "No attendees"
-    
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         action,
@@ -1196,30 +1696,13 @@ async def delete_meeting(
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     
-    # Get contact details for proper logging before deletion
-    target_contact = None
-    if meeting.get('attendees') and len(meeting['attendees']) > 0:
-        first_attendee = meeting['attendees'][0]
-        if 'phone' in first_attendee:
-            target_contact = await db.contacts.find_one({"phone": first_attendee['phone']}, {"_id": 0})
-    
-    # Use contact phone as target, fallback to meeting title
-    log_target = target_contact['phone'] if target_contact else meeting['title']
-    
-    await db.meetings.delete_one({"id": meeting_id})
-    
-    # Create detailed attendee info for better logging
-    attendee_info = []
-    if meeting.get('attendees'):
-        for attendee in meeting['attendees']:
-            if 'phone' in attendee:
-                attendee_info.append(f"{attendee.get('name', 'Unknown')} ({attendee['phone']})")
-            else:
-                attendee_info.append(attendee.get('name', 'Unknown'))
-    
-    attendee_details = ", ".join(attendee_info) if attendee_info else "No attendees"
+    # Build the logging context alongside the delete
+    (log_target, attendee_details), _ = await asyncio.gather(
+        meeting_log_context(meeting),
+        db.meetings.delete_one({"id": meeting_id})
+    )
     
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Deleted meeting",
@@ -1237,7 +1720,7 @@ async def create_demo(
     current_user: dict = Depends(get_current_user)
 ):
     """Mark a demo as given"""
-    contact = await db.contacts.find_one({"id": demo_data.contact_id}, {"_id": 0})
+    contact = await load_contact(demo_data.contact_id, CONTACT_LOG_FIELDS)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     
@@ -1248,22 +1731,17 @@ async def create_demo(
     )
     
     await db.demos.insert_one(demo.model_dump())
+    await bump_cache_generation("demos")
     
     # Get shop name for logging
-    contact_data = contact.get('data', {})
-    shop_name = (
-        contact_data.get('shop_name') or 
-        contact_data.get('Shop_Name') or 
-        contact_data.get('Shop Name') or
-        'Unknown Shop'
-    )
+    shop_name = contact_shop_name(contact.get('data')) or 'Unknown Shop'
     
-    await log_activity(
+    log_activity(
         current_user['id'],
         current_user['email'],
         "Demo given",
         target=contact['phone'],
-        details=f"Shop: {shop_name}, Given at: {demo.given_at}"
+        details=f"Shop: {shop_name}, Given at: {demo.given_at.isoformat()}"
     )
     
     return demo
@@ -1275,43 +1753,37 @@ async def mark_demo_watched(
     current_user: dict = Depends(get_current_user)
 ):
     """Mark a demo as watched/checked"""
-    demo = await db.demos.find_one({"id": demo_id}, {"_id": 0})
-    if not demo:
-        raise HTTPException(status_code=404, detail="Demo not found")
-    
-    if demo['user_id'] != current_user['id']:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    watched_at = watch_data.watched_at or utc_now()
     
-    watched_at = watch_data.watched_at or datetime.now(timezone.utc).isoformat()
-    
-    await db.demos.update_one(
-        {"id": demo_id},
+    # Ownership is part of the filter, so the check and the update are one atomic round trip
+    demo = await db.demos.find_one_and_update(
+        {"id": demo_id, "user_id": current_user['id']},
         {
             "$set": {
                 "watched": True,
                 "watched_at": watched_at,
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "updated_at": utc_now_iso()
             }
-        }
+        },
+        projection={"_id": 0, "contact_id": 1}
     )
+    if not demo:
+        if await db.demos.find_one({"id": demo_id}, {"_id": 1}):
+            raise HTTPException(status_code=403, detail="Not authorized")
+        raise HTTPException(status_code=404, detail="Demo not found")
+    await bump_cache_generation("demos")
     
     # Get contact for logging
-    contact = await db.contacts.find_one({"id": demo['contact_id']}, {"_id": 0})
+    contact = await load_contact(demo['contact_id'], CONTACT_LOG_FIELDS)
     if contact:
-        contact_data = contact.get('data', {})
-        shop_name = (
-            contact_data.get('shop_name') or 
-            contact_data.get('Shop_Name') or 
-            contact_data.get('Shop Name') or
-            'Unknown Shop'
-        )
+        shop_name = contact_shop_name(contact.get('data')) or 'Unknown Shop'
         
-        await log_activity(
+        log_activity(
             current_user['id'],
             current_user['email'],
             "Demo watched",
             target=contact['phone'],
-            details=f"Shop: {shop_name}, Watched at: {watched_at}"
+            details=f"Shop: {shop_name}, Watched at: {watched_at.isoformat()}"
         )
     
     return {"message": "Demo marked as watched", "watched_at": watched_at}
@@ -1327,49 +1799,31 @@ async def get_contact_demos(
         {"_id": 0}
     ).sort("given_at", -1).to_list(None)
     
-    return demos
+    return ORJSONResponse(demos)
 
-@api_router.get("/demos/report")
-async def get_demo_report(
-    start: str,
-    end: str,
-    group_by: str = "day",  # day, week, month
-    current_user: dict = Depends(get_current_user)
-):
-    """Get demo statistics grouped by time period"""
+def demo_range_match(start: str, end: str) -> Dict[str, Any]:
+    """given_at $match stage for a start/end ISO date range"""
     try:
         start_date = datetime.fromisoformat(start.replace('Z', '+00:00'))
         end_date = datetime.fromisoformat(end.replace('Z', '+00:00'))
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format")
     
-    # MongoDB aggregation pipeline
-    if group_by == "day":
-        date_format = "%Y-%m-%d"
-    elif group_by == "week":
-        date_format = "%Y-%U"  # Year-Week
-    elif group_by == "month":
-        date_format = "%Y-%m"
-    else:
-        raise HTTPException(status_code=400, detail="Invalid group_by parameter")
-    
-    pipeline = [
-        {
-            "$match": {
-                "given_at": {
-                    "$gte": start_date.isoformat(),
-                    "$lte": end_date.isoformat()
-                }
-            }
-        },
+    return {"$match": {"given_at": {"$gte": start_date, "$lte": end_date}}}
+
+# Period label formats; the group_by key doubles as the $dateTrunc unit
+DEMO_PERIOD_FORMATS = {
+    "day": "%Y-%m-%d",
+    "week": "%G-W%V",  # ISO week: Monday-based, a week spanning New Year stays one bucket
+    "month": "%Y-%m",
+}
+
+def demo_stats_stages(group_id: Any) -> List[Dict[str, Any]]:
+    """$group/$addFields stages counting given and watched demos per group_id"""
+    return [
         {
             "$group": {
-                "_id": {
-                    "$dateToString": {
-                        "format": date_format,
-                        "date": {"$dateFromString": {"dateString": "$given_at"}}
-                    }
-                },
+                "_id": group_id,
                 "given": {"$sum": 1},
                 "watched": {
                     "$sum": {
@@ -1388,150 +1842,374 @@ async def get_demo_report(
                     ]
                 }
             }
-        },
-        {"$sort": {"_id": 1}}
+        }
     ]
+
+def demo_period_stages(group_by: str) -> List[Dict[str, Any]]:
+    """Stages bucketing demos by day, week or month, oldest period first"""
+    if group_by not in DEMO_PERIOD_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid group_by parameter")
     
-    result = await db.demos.aggregate(pipeline).to_list(None)
-    
-    # Format the result
-    formatted_result = []
-    for item in result:
-        formatted_result.append({
-            "period": item["_id"],
+    # Bucket on the date itself; labels are formatted by format_demo_report
+    period = {"date": "$given_at", "unit": group_by}
+    if group_by == "week":
+        period["startOfWeek"] = "monday"  # ISO weeks, matching the %G-W%V label
+    return [
+        *demo_stats_stages({"$dateTrunc": period}),
+        {"$sort": {"_id": 1}}
+    ]
+
+def format_demo_report(result: List[dict], group_by: str) -> List[dict]:
+    """Report rows with period labels and rounded conversion"""
+    date_format = DEMO_PERIOD_FORMATS[group_by]
+    return [
+        {
+            "period": item["_id"].strftime(date_format),
             "given": item["given"],
             "watched": item["watched"],
             "conversion": round(item["conversion"], 3)
-        })
+        }
+        for item in result
+    ]
+
+def format_demo_summary(result: List[dict]) -> dict:
+    """Summary totals, zeros when no demos matched"""
+    if not result:
+        return {"given": 0, "watched": 0, "conversion": 0}
     
-    return formatted_result
+    data = result[0]
+    return {
+        "given": data["given"],
+        "watched": data["watched"],
+        "conversion": round(data["conversion"], 3)
+    }
+
+@api_router.get("/demos/report")
+@cached_response("demos")
+async def get_demo_report(
+    start: str,
+    end: str,
+    group_by: str = "day",  # day, week, month
+    current_user: dict = Depends(get_current_user)
+):
+    """Get demo statistics grouped by time period"""
+    pipeline = [demo_range_match(start, end), *demo_period_stages(group_by)]
+    result = await (await db.demos.aggregate(pipeline)).to_list(None)
+    return format_demo_report(result, group_by)
 
 @api_router.get("/demos/summary")
+@cached_response("demos")
 async def get_demo_summary(
     start: str,
     end: str,
     current_user: dict = Depends(get_current_user)
 ):
     """Get overall demo statistics for a date range"""
-    try:
-        start_date = datetime.fromisoformat(start.replace('Z', '+00:00'))
-        end_date = datetime.fromisoformat(end.replace('Z', '+00:00'))
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format")
-    
+    pipeline = [demo_range_match(start, end), *demo_stats_stages(None)]
+    result = await (await db.demos.aggregate(pipeline)).to_list(None)
+    return format_demo_summary(result)
+
+@api_router.get("/demos/dashboard")
+@cached_response("demos")
+async def get_demo_dashboard(
+    start: str,
+    end: str,
+    group_by: str = "day",  # day, week, month
+    current_user: dict = Depends(get_current_user)
+):
+    """Get the demo summary and per-period report in one aggregation pass"""
     pipeline = [
+        demo_range_match(start, end),
         {
-            "$match": {
-                "given_at": {
-                    "$gte": start_date.isoformat(),
-                    "$lte": end_date.isoformat()
-                }
-            }
-        },
-        {
-            "$group": {
-                "_id": None,
-                "given": {"$sum": 1},
-                "watched": {
-                    "$sum": {
-                        "$cond": [{"$eq": ["$watched", True]}, 1, 0]
-                    }
-                }
-            }
-        },
-        {
-            "$addFields": {
-                "conversion": {
-                    "$cond": [
-                        {"$gt": ["$given", 0]},
-                        {"$divide": ["$watched", "$given"]},
-                        0
-                    ]
-                }
+            "$facet": {
+                "summary": demo_stats_stages(None),
+                "report": demo_period_stages(group_by)
             }
         }
     ]
-    
-    result = await db.demos.aggregate(pipeline).to_list(None)
-    
-    if not result:
-        return {"given": 0, "watched": 0, "conversion": 0}
-    
-    data = result[0]
+    result = (await (await db.demos.aggregate(pipeline)).to_list(None))[0]
     return {
-        "given": data["given"],
-        "watched": data["watched"],
-        "conversion": round(data["conversion"], 3)
+        "summary": format_demo_summary(result["summary"]),
+        "report": format_demo_report(result["report"], group_by)
     }
 
 # ============ SCHEDULER FOR FOLLOW-UP ALERTS ============
 
+ALERT_INTERVAL = timedelta(minutes=5)
+# Workers started together by one deployment share a single contact recount
+CONTACT_STATS_REBUILD_LEASE = timedelta(minutes=10)
+
+async def send_followup_alert(followup: dict) -> str:
+    """Email the reminder for a follow-up and return its id"""
+    contact = followup['contact']
+    contact_name = contact.get('customer_name') or contact['phone']
+    
+    subject = f"Follow-up Reminder: {contact_name}"
+    body = f"""Hello,
+
+This is a reminder for your follow-up with:
+
+Contact: {contact_name}
+Phone: {contact['phone']}
+Scheduled: {followup['follow_up_date'].isoformat()}
+Notes: {followup.get('notes', 'N/A')}
+
+Best regards,
+SmartCRM"""
+    
+    await send_email_notification(followup['user_email'], subject, body)
+    logging.info(f"Sent follow-up alert for contact {contact_name}")
+    return followup['id']
+
+async def claim_scheduler_run(job: str, lease: timedelta) -> bool:
+    """Take a job's lease in Mongo; False while another worker process holds it"""
+    now = utc_now()
+    try:
+        await db.scheduler_locks.find_one_and_update(
+            {"_id": job, "until": {"$lte": now}},
+            {"$set": {"until": now + lease}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        # The lock document exists with an unexpired lease
+        return False
+
 async def check_followup_alerts():
     """Check for follow-ups that need alerts"""
     try:
-        now = datetime.now(timezone.utc)
+        # Every uvicorn worker runs the scheduler; only the first one per interval sends
+        if not await claim_scheduler_run("followup_alerts", ALERT_INTERVAL - timedelta(minutes=1)):
+            return
+        
+        now = utc_now()
         alert_window = now + timedelta(minutes=30)  # Alert 30 minutes before
         
         followups = await db.followups.find({
             "status": "pending",
             "notified": False,
             "follow_up_date": {
-                "$lte": alert_window.isoformat()
+                "$lte": alert_window
             }
         }, {"_id": 0}).to_list(None)
         
-        for followup in followups:
-            # Get contact details
-            contact = await db.contacts.find_one({"id": followup['contact_id']}, {"_id": 0})
-            if not contact:
-                continue
-            
-            contact_name = contact['data'].get('name', contact['phone'])
-            
-            # Send email notification
-            subject = f"Follow-up Reminder: {contact_name}"
-            body = f"""Hello,
-
-This is a reminder for your follow-up with:
-
-Contact: {contact_name}
-Phone: {contact['phone']}
-Scheduled: {followup['follow_up_date']}
-Notes: {followup.get('notes', 'N/A')}
-
-Best regards,
-SmartCRM"""
-            
-            await send_email_notification(followup['user_email'], subject, body)
-            
-            # Mark as notified
-            await db.followups.update_one(
-                {"id": followup['id']},
+        await attach_followup_contacts(followups)
+        
+        # Sends run concurrently, bounded by the SMTP session pool
+        results = await asyncio.gather(
+            *(send_followup_alert(followup) for followup in followups if followup.get('contact')),
+            return_exceptions=True
+        )
+        notified_ids = []
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error(f"Error sending follow-up alert: {str(result)}")
+            else:
+                notified_ids.append(result)
+        
+        # Mark as notified in one write
+        if notified_ids:
+            await db.followups.update_many(
+                {"id": {"$in": notified_ids}},
                 {"$set": {"notified": True}}
             )
-            
-            logging.info(f"Sent follow-up alert for contact {contact_name}")
+            await bump_cache_generation("followups")
+        
+        # Runs after the alert query, which only picks up pending follow-ups
+        await mark_followups_overdue(now)
     
     except Exception as e:
         logging.error(f"Error in follow-up alert check: {str(e)}")
 
 # ============ APP STARTUP ============
 
+# (collection, keys, options) for the lookups and sorts the routes rely on
+INDEXES = [
+    # Unique phone index lets bulk imports rely on the database for duplicate detection
+    ("contacts", "phone", {"unique": True}),
+    ("contacts", "id", {"unique": True}),
+    ("contacts", [("created_at", -1), ("id", -1)], {}),
+    # Also serves the status sort/group of rebuild_contact_stats
+    ("contacts", [("status", 1), ("created_at", -1), ("id", -1)], {}),
+    # Word-prefix contact search over the name/shop/address fields
+    ("contacts", "search_keys", {}),
+    ("users", "email", {"unique": True}),
+    ("users", "id", {"unique": True}),
+    ("notes", [("contact_id", 1), ("created_at", -1)], {}),
+    ("followups", "id", {"unique": True}),
+    ("followups", "contact_id", {}),
+    ("followups", [("status", 1), ("follow_up_date", 1), ("id", 1)], {}),
+    # Alert scheduler: status/notified equality, then the follow_up_date range
+    ("followups", [("status", 1), ("notified", 1), ("follow_up_date", 1)], {}),
+    ("activity_logs", [("timestamp", -1), ("id", -1)], {}),
+    ("meetings", "id", {"unique": True}),
+    ("meetings", [("user_id", 1), ("date", 1)], {}),
+    ("demos", "id", {"unique": True}),
+    ("demos", [("contact_id", 1), ("given_at", -1)], {}),
+    # Date-range filter of the demo report and summary
+    ("demos", "given_at", {}),
+]
+
+def queue_contact_update(contact_id: str, fields: Dict[str, Any]):
+    """Buffer a $set for a contact; flush_contact_updates writes it out"""
+    pending_contact_updates.setdefault(contact_id, {}).update(fields)
+
+async def flush_contact_updates():
+    """Write all buffered contact updates in one unordered bulk_write"""
+    global pending_contact_updates
+    if not pending_contact_updates:
+        return
+    snapshot, pending_contact_updates = pending_contact_updates, {}
+    try:
+        await db.contacts.bulk_write(
+            [UpdateOne({"id": cid}, {"$set": fields}) for cid, fields in snapshot.items()],
+            ordered=False
+        )
+        await invalidate_contacts(*snapshot)
+    except Exception as e:
+        logger.error(f"Error flushing contact updates: {str(e)}")
+        # Requeue, keeping anything written to the buffer since the snapshot
+        for cid, fields in snapshot.items():
+            pending_contact_updates[cid] = {**fields, **pending_contact_updates.get(cid, {})}
+
+async def contact_update_flusher():
+    while True:
+        await asyncio.sleep(CONTACT_FLUSH_INTERVAL_SECONDS)
+        await flush_contact_updates()
+
+def drain_activity_logs(batch: List[dict]) -> List[dict]:
+    """Move queued activity log entries into batch, up to ACTIVITY_LOG_BATCH_SIZE"""
+    while len(batch) < ACTIVITY_LOG_BATCH_SIZE and not activity_log_queue.empty():
+        batch.append(activity_log_queue.get_nowait())
+    return batch
+
+async def write_activity_logs(batch: List[dict]):
+    try:
+        await db.activity_logs.insert_many(batch, ordered=False)
+    except Exception as e:
+        logger.error(f"Error writing {len(batch)} activity logs: {str(e)}")
+
+async def activity_log_flusher():
+    while True:
+        batch = drain_activity_logs([await activity_log_queue.get()])
+        try:
+            if len(batch) < ACTIVITY_LOG_BATCH_SIZE:
+                # Let the rest of a burst arrive before writing
+                await asyncio.sleep(ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS)
+                drain_activity_logs(batch)
+        finally:
+            # Also runs on cancellation, so a batch in hand is never dropped
+            await write_activity_logs(batch)
+
+async def flush_activity_logs():
+    """Write everything still queued (used at shutdown)"""
+    while not activity_log_queue.empty():
+        await write_activity_logs(drain_activity_logs([]))
+
+# Fields stored as BSON dates that older documents hold as ISO strings
+DATE_FIELDS = [
+    ("followups", "follow_up_date"),
+    ("demos", "given_at"),
+    ("demos", "watched_at"),
+]
+
+async def migrate_date_fields():
+    """Convert DATE_FIELDS values still stored as ISO strings to BSON dates"""
+    for collection, field in DATE_FIELDS:
+        try:
+            result = await db[collection].update_many(
+                {field: {"$type": "string"}},
+                [{"$set": {field: {"$toDate": f"${field}"}}}]
+            )
+            if result.modified_count:
+                logging.info(f"Converted {result.modified_count} {collection}.{field} values to dates")
+        except Exception as e:
+            logging.warning(f"Could not convert {collection}.{field} to dates: {str(e)}")
+
+async def backfill_contact_search_keys():
+    """Write search_keys on contacts stored before contact search used them"""
+    projection = {"_id": 0, "id": 1, **{field: 1 for field in CONTACT_SEARCH_FIELDS}}
+    ops = []
+    async for contact in db.contacts.find({"search_keys": {"$exists": False}}, projection):
+        ops.append(UpdateOne({"id": contact["id"]}, {"$set": {"search_keys": contact_search_keys(contact)}}))
+        if len(ops) == IMPORT_BATCH_SIZE:
+            await db.contacts.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await db.contacts.bulk_write(ops, ordered=False)
+
+async def prepare_database():
+    """Startup database work: date migration first, so indexes are built over the converted values"""
+    try:
+        # Select the server and open the first pooled connections before requests arrive
+        await db.command("ping")
+    except Exception as e:
+        logging.warning(f"MongoDB ping failed: {str(e)}")
+    await migrate_date_fields()
+    try:
+        await backfill_contact_search_keys()
+    except Exception as e:
+        logging.warning(f"Could not backfill contact search keys: {str(e)}")
+    await ensure_indexes()
+    # The recount $sets counters from a snapshot, which would overwrite $inc changes made while it
+    # runs: only the first worker of a deployment does it, before it serves any requests
+    if await claim_scheduler_run("rebuild_contact_stats", CONTACT_STATS_REBUILD_LEASE):
+        try:
+            await rebuild_contact_stats()
+        except Exception as e:
+            logging.warning(f"Could not recount contacts per status: {str(e)}")
+
+async def ensure_indexes():
+    """Create the indexes in INDEXES.
+
+    A failed unique index is raised (e.g. legacy duplicates block the build): contact
+    create, update and import rely on them to reject duplicates. Other failures are logged.
+    """
+    for collection, keys, options in INDEXES:
+        try:
+            await db[collection].create_index(keys, **options)
+        except Exception as e:
+            if options.get("unique"):
+                logging.error(f"Could not create unique index {keys} on {collection}: {str(e)}")
+                raise
+            logging.warning(f"Could not create index {keys} on {collection}: {str(e)}")
+
 @app.on_event("startup")
 async def startup_event():
+    # Migrate and build indexes before serving: requests must not run without the unique indexes
+    await prepare_database()
+    app.state.contact_flush_task = asyncio.create_task(contact_update_flusher())
+    app.state.activity_log_task = asyncio.create_task(activity_log_flusher())
+    
     # Start scheduler
-    scheduler.add_job(check_followup_alerts, 'interval', minutes=5)
+    # A slow run never overlaps the next one; missed ticks collapse into a single run
+    scheduler.add_job(
+        check_followup_alerts, 'interval', seconds=ALERT_INTERVAL.total_seconds(),
+        max_instances=1, coalesce=True, misfire_grace_time=60
+    )
     scheduler.start()
     logging.info("Follow-up alert scheduler started")
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    client.close()
+    app.state.contact_flush_task.cancel()
+    await flush_contact_updates()
+    app.state.activity_log_task.cancel()
+    await asyncio.gather(app.state.activity_log_task, return_exceptions=True)
+    await flush_activity_logs()
+    await client.close()
     scheduler.shutdown()
+    await close_smtp()
+    if redis_client is not None:
+        await redis_client.aclose()
+    password_pool.shutdown(wait=False)
 
 # Include router
 app.include_router(api_router)
 
+# Compress JSON bodies over 1 KB (contact and log listings run to hundreds of KB)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -1544,8 +2222,16 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # WEB_CONCURRENCY worker processes (e.g. the CPU count); caches without Redis are per worker.
+    # uvloop and httptools are used when installed.
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.environ.get('WEB_CONCURRENCY', '1')),
+        loop="auto",
+        http="auto"
+    )
\ No newline at end of file
@@ -4,18 +4,84 @@ SmartCRM Backend API Testing Suite
 Tests all backend endpoints according to test_result.md requirements
 """
 
-import requests
+import httpx
+import asyncio
 import json
 import io
-import pandas as pd
 from datetime import datetime, timezone, timedelta
-import uuid
+import secrets
 import os
 import sys
+import functools
+import random
+import time
+
+# orjson decodes responses straight from bytes (and encodes straight to bytes) when it's installed;
+# the stdlib json module otherwise
+try:
+    import orjson
+    
+    def parse_json(response):
+        return orjson.loads(response.content)
+    
+    dump_json = orjson.dumps
+except ImportError:
+    def parse_json(response):
+        return response.json()
+    
+    def dump_json(value):
+        return json.dumps(value).encode()
 
 # Base URL from frontend/.env
 BASE_URL = "https://smartcrm-hub-3.preview.emergentagent.com/api"
 
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Transient failures (connection errors, rate limiting, gateway errors) are retried with exponential backoff
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Methods that are safe to resend after the server may have acted on them; others
+# (POST signup/contacts/followups) are only retried when the connection never opened
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Preconditions for run_case: (attribute, label) pairs that earlier tests must have set
+TOKEN_REQUIRED = (("token", "token"),)
+CONTACT_REQUIRED = (("token", "token"), ("test_contact_id", "contact ID"))
+
+def has_keys(*keys):
+    """Check that a JSON object response has every one of keys"""
+    return lambda result: isinstance(result, dict) and all(key in result for key in keys)
+
+def is_list(result):
+    return isinstance(result, list)
+
+# Successful GET responses are reused for a few seconds, until the next write
+GET_CACHE_TTL = 5.0
+
+def retry_delay(attempt, response=None):
+    """Seconds to wait before retry number attempt + 1, honouring a Retry-After header in seconds"""
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdigit():
+        return int(retry_after)
+    return RETRY_BACKOFF * 2 ** attempt + random.uniform(0, RETRY_BACKOFF)
+
+@functools.lru_cache(maxsize=4)
+def build_xlsx(columns, rows):
+    """Workbook bytes for a header and rows, given as tuples so a sheet is only built once"""
+    # Imported here so runs that never build a workbook don't load openpyxl
+    from openpyxl import Workbook
+    
+    # Write-only mode streams the rows out without building a cell grid
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(columns)
+    for row in rows:
+        ws.append(row)
+    excel_buffer = io.BytesIO()
+    wb.save(excel_buffer)
+    return excel_buffer.getvalue()
+
 class SmartCRMTester:
     def __init__(self):
         self.base_url = BASE_URL
@@ -23,14 +89,21 @@ class SmartCRMTester:
         self.user_id = None
         self.user_email = None
         self.test_contact_id = None
+        self.test_contact_phone = None
         self.test_followup_id = None
+        # One client for the whole run; over HTTP/2 the concurrent tests share a single connection
+        self.client = httpx.AsyncClient(base_url=self.base_url, http2=True, timeout=httpx.Timeout(15.0, connect=3.05))
+        self.get_cache = {}
         self.results = {
             "passed": 0,
             "failed": 0,
-            "errors": []
+            "errors": [],
+            "timings": {}
         }
     
-    def log_result(self, test_name, success, message=""):
+    def log_result(self, test_name, success, message="", duration=None):
+        if duration is not None:
+            self.results["timings"][test_name] = duration
         if success:
             self.results["passed"] += 1
             print(f"✅ {test_name}: PASSED {message}")
@@ -39,153 +112,136 @@ class SmartCRMTester:
             self.results["errors"].append(f"{test_name}: {message}")
             print(f"❌ {test_name}: FAILED - {message}")
     
-    def make_request(self, method, endpoint, data=None, files=None, headers=None):
-        """Make HTTP request with proper error handling"""
-        url = f"{self.base_url}{endpoint}"
-        
-        # Add auth header if token exists
-        if self.token and headers is None:
-            headers = {"Authorization": f"Bearer {self.token}"}
-        elif self.token and headers:
-            headers["Authorization"] = f"Bearer {self.token}"
-        
+    async def probe_backend(self):
+        """Whether the backend answers at all, checked once with a short timeout and no retries"""
         try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == "POST":
-                if files:
-                    response = requests.post(url, data=data, files=files, headers=headers, timeout=30)
-                else:
-                    response = requests.post(url, json=data, headers=headers, timeout=30)
-            elif method == "PUT":
-                response = requests.put(url, json=data, headers=headers, timeout=30)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=30)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-            
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Request error for {method} {url}: {str(e)}")
-            return None
-    
-    def test_auth_signup(self):
-        """Test user signup"""
-        test_email = f"test_{uuid.uuid4().hex[:8]}@example.com"
-        test_password = "testpassword123"
-        
-        data = {
-            "email": test_email,
-            "password": test_password
-        }
-        
-        response = self.make_request("POST", "/auth/signup", data)
-        
-        if response is None:
-            self.log_result("Auth Signup", False, "Request failed")
+            response = await self.client.get("/", timeout=2)
+        except httpx.HTTPError as e:
+            print(f"Backend unreachable at {self.base_url}: {str(e)}")
             return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "token" in result and "user" in result:
-                self.token = result["token"]
-                self.user_id = result["user"]["id"]
-                self.user_email = result["user"]["email"]
-                self.log_result("Auth Signup", True, f"User created: {test_email}")
-                return True
-            else:
-                self.log_result("Auth Signup", False, "Missing token or user in response")
-                return False
-        else:
-            self.log_result("Auth Signup", False, f"Status {response.status_code}: {response.text}")
+        if response.status_code >= 500:
+            print(f"Backend unhealthy at {self.base_url}: status {response.status_code}")
             return False
+        return True
     
-    def test_auth_login(self):
-        """Test user login with existing credentials"""
-        if not self.user_email:
-            self.log_result("Auth Login", False, "No user email from signup")
-            return False
-        
-        data = {
-            "email": self.user_email,
-            "password": "testpassword123"
-        }
-        
-        response = self.make_request("POST", "/auth/login", data)
-        
-        if response is None:
-            self.log_result("Auth Login", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "token" in result:
-                self.token = result["token"]  # Update token
-                self.log_result("Auth Login", True, "Login successful")
-                return True
-            else:
-                self.log_result("Auth Login", False, "Missing token in response")
-                return False
-        else:
-            self.log_result("Auth Login", False, f"Status {response.status_code}: {response.text}")
-            return False
+    async def run_parallel(self, *tests):
+        """Run independent tests concurrently on the shared client"""
+        return await asyncio.gather(*(test() for test in tests))
     
-    def test_auth_me(self):
-        """Test get current user"""
-        if not self.token:
-            self.log_result("Auth Me", False, "No token available")
-            return False
-        
-        response = self.make_request("GET", "/auth/me")
-        
-        if response is None:
-            self.log_result("Auth Me", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "id" in result and "email" in result:
-                self.log_result("Auth Me", True, f"User info retrieved: {result['email']}")
-                return True
+    async def make_request(self, method, endpoint, data=None, files=None, headers=None):
+        """Make HTTP request with proper error handling"""
+        cache_key = (endpoint, self.client.headers.get("Authorization"))
+        if method == "GET" and headers is None:
+            cached = self.get_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < GET_CACHE_TTL:
+                return cached[1]
+        elif method != "GET":
+            # Every write also adds an activity log, so any of them can change any GET; start the cache over
+            self.get_cache.clear()
+        
+        response = await self.send_with_retries(method, endpoint, data, files, headers)
+        if method == "GET" and headers is None and response is not None and response.status_code == 200:
+            self.get_cache[cache_key] = (time.monotonic(), response)
+        return response
+    
+    async def send_with_retries(self, method, endpoint, data, files, headers):
+        """Send one request, retrying transient failures"""
+        # The client carries the Authorization header once signup/login has set it
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(MAX_RETRIES + 1):
+            response = None
+            try:
+                response = await self.client.request(
+                    method, endpoint,
+                    json=data if not files else None,
+                    data=data if files else None,
+                    files=files,
+                    headers=headers
+                )
+            except httpx.TransportError as e:
+                connect_failed = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt == MAX_RETRIES or not (idempotent or connect_failed):
+                    print(f"Request error for {method} {self.base_url}{endpoint}: {str(e)}")
+                    return None
+            except httpx.HTTPError as e:
+                print(f"Request error for {method} {self.base_url}{endpoint}: {str(e)}")
+                return None
             else:
-                self.log_result("Auth Me", False, "Missing user info in response")
-                return False
-        else:
-            self.log_result("Auth Me", False, f"Status {response.status_code}: {response.text}")
-            return False
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES or not idempotent:
+                    return response
+            await asyncio.sleep(retry_delay(attempt, response))
     
-    def test_contacts_count(self):
-        """Test contact statistics"""
-        if not self.token:
-            self.log_result("Contacts Count", False, "No token available")
-            return False
+    async def run_case(self, name, method, endpoint, expect, describe, failure, data=None, files=None,
+                       status=200, requires=TOKEN_REQUIRED):
+        """Request an endpoint and log whether the response is what the test expects, with how long it took.
+        
+        requires lists (attribute, label) pairs that must be set before the request is sent;
+        expect(result) checks the parsed body, describe(result) gives the success message.
+        Returns the parsed body (True when status isn't 200) on success, None otherwise.
+        """
+        started = time.perf_counter()
+        success, message, result = await self.check_case(method, endpoint, expect, describe, failure, data, files, status, requires)
+        self.log_result(name, success, message, duration=time.perf_counter() - started)
+        return result if success else None
+    
+    async def check_case(self, method, endpoint, expect, describe, failure, data, files, status, requires):
+        """(success, message, parsed body) for one run_case request"""
+        missing = [label for attribute, label in requires if not getattr(self, attribute)]
+        if missing:
+            return False, f"No {' or '.join(missing)} available", None
         
-        response = self.make_request("GET", "/contacts/count")
+        response = await self.make_request(method, endpoint, data, files)
         
         if response is None:
-            self.log_result("Contacts Count", False, "Request failed")
-            return False
+            return False, "Request failed", None
         
-        if response.status_code == 200:
-            result = response.json()
-            if "total" in result and "by_status" in result:
-                self.log_result("Contacts Count", True, f"Total contacts: {result['total']}")
-                return True
-            else:
-                self.log_result("Contacts Count", False, "Missing count data in response")
-                return False
-        else:
-            self.log_result("Contacts Count", False, f"Status {response.status_code}: {response.text}")
-            return False
+        if response.status_code != status:
+            return False, f"Status {response.status_code}: {response.text}", None
+        if status != 200:
+            return True, describe(None), True
+        
+        result = parse_json(response)
+        if not expect(result):
+            return False, failure, None
+        return True, describe(result), result
     
-    def test_create_contact(self):
+    async def test_auth_signup(self):
+        """Test user signup"""
+        test_email = f"test_{secrets.token_hex(4)}@example.com"
+        data = {"email": test_email, "password": "testpassword123"}
+        
+        result = await self.run_case(
+            "Auth Signup", "POST", "/auth/signup", has_keys("token", "user"),
+            lambda r: f"User created: {test_email}", "Missing token or user in response",
+            data=data, requires=()
+        )
+        if result is None:
+            return False
+        self.token = result["token"]
+        self.client.headers["Authorization"] = f"Bearer {self.token}"
+        self.user_id = result["user"]["id"]
+        self.user_email = result["user"]["email"]
+        return True
+    
+    async def test_auth_login(self):
+        """Test user login with existing credentials"""
+        data = {"email": self.user_email, "password": "testpassword123"}
+        
+        result = await self.run_case(
+            "Auth Login", "POST", "/auth/login", has_keys("token"),
+            lambda r: "Login successful", "Missing token in response",
+            data=data, requires=(("user_email", "user email from signup"),)
+        )
+        if result is None:
+            return False
+        self.token = result["token"]  # Update token
+        self.client.headers["Authorization"] = f"Bearer {self.token}"
+        return True
+    
+    async def test_create_contact(self):
         """Test creating a contact"""
-        if not self.token:
-            self.log_result("Create Contact", False, "No token available")
-            return False
-        
         data = {
-            "phone": f"+1555{uuid.uuid4().hex[:7]}",
+            "phone": f"+1555{secrets.token_hex(4)[:7]}",
             "status": "Follow-up",
             "data": {
                 "name": "John Smith",
@@ -194,79 +250,19 @@ class SmartCRMTester:
             }
         }
         
-        response = self.make_request("POST", "/contacts", data)
-        
-        if response is None:
-            self.log_result("Create Contact", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "id" in result and "phone" in result:
-                self.test_contact_id = result["id"]
-                self.log_result("Create Contact", True, f"Contact created: {result['phone']}")
-                return True
-            else:
-                self.log_result("Create Contact", False, "Missing contact data in response")
-                return False
-        else:
-            self.log_result("Create Contact", False, f"Status {response.status_code}: {response.text}")
-            return False
-    
-    def test_get_contacts(self):
-        """Test getting contacts list"""
-        if not self.token:
-            self.log_result("Get Contacts", False, "No token available")
-            return False
-        
-        response = self.make_request("GET", "/contacts")
-        
-        if response is None:
-            self.log_result("Get Contacts", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if isinstance(result, list):
-                self.log_result("Get Contacts", True, f"Retrieved {len(result)} contacts")
-                return True
-            else:
-                self.log_result("Get Contacts", False, "Response is not a list")
-                return False
-        else:
-            self.log_result("Get Contacts", False, f"Status {response.status_code}: {response.text}")
+        result = await self.run_case(
+            "Create Contact", "POST", "/contacts", has_keys("id", "phone"),
+            lambda r: f"Contact created: {r['phone']}", "Missing contact data in response",
+            data=data
+        )
+        if result is None:
             return False
+        self.test_contact_id = result["id"]
+        self.test_contact_phone = result["phone"]
+        return True
     
-    def test_get_contact_by_id(self):
-        """Test getting specific contact"""
-        if not self.token or not self.test_contact_id:
-            self.log_result("Get Contact By ID", False, "No token or contact ID available")
-            return False
-        
-        response = self.make_request("GET", f"/contacts/{self.test_contact_id}")
-        
-        if response is None:
-            self.log_result("Get Contact By ID", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "id" in result and result["id"] == self.test_contact_id:
-                self.log_result("Get Contact By ID", True, f"Contact retrieved: {result['phone']}")
-                return True
-            else:
-                self.log_result("Get Contact By ID", False, "Contact ID mismatch")
-                return False
-        else:
-            self.log_result("Get Contact By ID", False, f"Status {response.status_code}: {response.text}")
-            return False
-    
-    def test_update_contact(self):
+    async def test_update_contact(self):
         """Test updating a contact"""
-        if not self.token or not self.test_contact_id:
-            self.log_result("Update Contact", False, "No token or contact ID available")
-            return False
-        
         data = {
             "status": "Interested",
             "data": {
@@ -276,107 +272,68 @@ class SmartCRMTester:
             }
         }
         
-        response = self.make_request("PUT", f"/contacts/{self.test_contact_id}", data)
-        
-        if response is None:
-            self.log_result("Update Contact", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "status" in result and result["status"] == "Interested":
-                self.log_result("Update Contact", True, "Contact updated successfully")
-                return True
-            else:
-                self.log_result("Update Contact", False, "Status not updated correctly")
-                return False
-        else:
-            self.log_result("Update Contact", False, f"Status {response.status_code}: {response.text}")
-            return False
+        return await self.run_case(
+            "Update Contact", "PUT", f"/contacts/{self.test_contact_id}", lambda r: r.get("status") == "Interested",
+            lambda r: "Contact updated successfully", "Status not updated correctly",
+            data=data, requires=CONTACT_REQUIRED
+        ) is not None
     
-    def test_log_call(self):
+    async def test_log_call(self):
         """Test logging a call"""
-        if not self.token or not self.test_contact_id:
-            self.log_result("Log Call", False, "No token or contact ID available")
-            return False
-        
-        response = self.make_request("POST", f"/contacts/{self.test_contact_id}/call")
-        
-        if response is None:
-            self.log_result("Log Call", False, "Request failed")
-            return False
+        return await self.run_case(
+            "Log Call", "POST", f"/contacts/{self.test_contact_id}/call", has_keys("message", "call_time"),
+            lambda r: f"Call logged at {r['call_time']}", "Missing call log data",
+            requires=CONTACT_REQUIRED
+        ) is not None
+    
+    async def test_duplicate_contact_prevention(self):
+        """Test duplicate contact prevention"""
+        # Try to create another contact with the phone number test_create_contact used
+        data = {
+            "phone": self.test_contact_phone,
+            "status": "Follow-up",
+            "data": {
+                "name": "Duplicate Test",
+                "email": "duplicate@example.com"
+            }
+        }
         
-        if response.status_code == 200:
-            result = response.json()
-            if "message" in result and "call_time" in result:
-                self.log_result("Log Call", True, f"Call logged at {result['call_time']}")
-                return True
-            else:
-                self.log_result("Log Call", False, "Missing call log data")
-                return False
-        else:
-            self.log_result("Log Call", False, f"Status {response.status_code}: {response.text}")
-            return False
+        return await self.run_case(
+            "Duplicate Prevention", "POST", "/contacts", None,
+            lambda r: "Duplicate contact correctly rejected", None,
+            data=data, status=400, requires=CONTACT_REQUIRED
+        ) is not None
     
-    def test_excel_preview(self):
+    async def test_excel_preview(self):
         """Test Excel file preview"""
-        if not self.token:
-            self.log_result("Excel Preview", False, "No token available")
-            return False
-        
         # Create a test Excel file
-        test_data = {
-            'Phone': ['+15551234567', '+15551234568', '+15551234569'],
-            'Name': ['Alice Johnson', 'Bob Wilson', 'Carol Davis'],
-            'Email': ['alice@example.com', 'bob@example.com', 'carol@example.com'],
-            'Company': ['ABC Corp', 'XYZ Ltd', 'Tech Solutions']
-        }
-        
-        df = pd.DataFrame(test_data)
-        excel_buffer = io.BytesIO()
-        df.to_excel(excel_buffer, index=False)
-        excel_buffer.seek(0)
-        
-        files = {'file': ('test_contacts.xlsx', excel_buffer.getvalue(), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')}
-        
-        # Note: For file upload, we need to handle headers differently
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = self.make_request("POST", "/contacts/preview", files=files, headers=headers)
-        
-        if response is None:
-            self.log_result("Excel Preview", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "columns" in result and "sample_data" in result:
-                self.log_result("Excel Preview", True, f"Columns: {result['columns']}")
-                return True
-            else:
-                self.log_result("Excel Preview", False, "Missing preview data")
-                return False
-        else:
-            self.log_result("Excel Preview", False, f"Status {response.status_code}: {response.text}")
-            return False
+        excel_bytes = build_xlsx(
+            ('Phone', 'Name', 'Email', 'Company'),
+            (
+                ('+15551234567', 'Alice Johnson', 'alice@example.com', 'ABC Corp'),
+                ('+15551234568', 'Bob Wilson', 'bob@example.com', 'XYZ Ltd'),
+                ('+15551234569', 'Carol Davis', 'carol@example.com', 'Tech Solutions')
+            )
+        )
+        files = {'file': ('test_contacts.xlsx', excel_bytes, XLSX_CONTENT_TYPE)}
+        
+        return await self.run_case(
+            "Excel Preview", "POST", "/contacts/preview", has_keys("columns", "sample_data"),
+            lambda r: f"Columns: {r['columns']}", "Missing preview data",
+            files=files
+        ) is not None
     
-    def test_excel_import(self):
+    async def test_excel_import(self):
         """Test Excel file import"""
-        if not self.token:
-            self.log_result("Excel Import", False, "No token available")
-            return False
-        
-        # Create a test Excel file with unique phone numbers
-        test_data = {
-            'Phone': [f'+1555{uuid.uuid4().hex[:7]}', f'+1555{uuid.uuid4().hex[:7]}'],
-            'Name': ['Import Test 1', 'Import Test 2'],
-            'Email': ['import1@example.com', 'import2@example.com'],
-            'Company': ['Import Corp 1', 'Import Corp 2']
-        }
-        
-        df = pd.DataFrame(test_data)
-        excel_buffer = io.BytesIO()
-        df.to_excel(excel_buffer, index=False)
-        excel_buffer.seek(0)
+        # Create a test Excel file with unique phone numbers (both drawn from one random read)
+        random_hex = os.urandom(8).hex()
+        excel_bytes = build_xlsx(
+            ('Phone', 'Name', 'Email', 'Company'),
+            (
+                (f'+1555{random_hex[:7]}', 'Import Test 1', 'import1@example.com', 'Import Corp 1'),
+                (f'+1555{random_hex[8:15]}', 'Import Test 2', 'import2@example.com', 'Import Corp 2')
+            )
+        )
         
         # Column mapping - the key should be the Excel column name, value should be the field name
         column_mapping = {
@@ -386,87 +343,33 @@ class SmartCRMTester:
             'company': 'Company'
         }
         
-        files = {'file': ('import_contacts.xlsx', excel_buffer.getvalue(), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')}
-        data = {'column_mapping': json.dumps(column_mapping)}
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
-        response = self.make_request("POST", "/contacts/import", data=data, files=files, headers=headers)
-        
-        if response is None:
-            self.log_result("Excel Import", False, "Request failed")
-            return False
+        # The mapping goes as a JSON part of the multipart body (no filename, so the backend reads it as a form field)
+        files = {
+            'file': ('import_contacts.xlsx', excel_bytes, XLSX_CONTENT_TYPE),
+            'column_mapping': (None, dump_json(column_mapping), 'application/json')
+        }
         
-        if response.status_code == 200:
-            result = response.json()
-            if "imported" in result and "skipped" in result:
-                self.log_result("Excel Import", True, f"Imported: {result['imported']}, Skipped: {result['skipped']}")
-                return True
-            else:
-                self.log_result("Excel Import", False, "Missing import statistics")
-                return False
-        else:
-            self.log_result("Excel Import", False, f"Status {response.status_code}: {response.text}")
-            return False
+        return await self.run_case(
+            "Excel Import", "POST", "/contacts/import", has_keys("imported", "skipped"),
+            lambda r: f"Imported: {r['imported']}, Skipped: {r['skipped']}", "Missing import statistics",
+            files=files
+        ) is not None
     
-    def test_create_note(self):
+    async def test_create_note(self):
         """Test creating a note"""
-        if not self.token or not self.test_contact_id:
-            self.log_result("Create Note", False, "No token or contact ID available")
-            return False
-        
         data = {
             "contact_id": self.test_contact_id,
             "content": "This is a test note for the contact."
         }
         
-        response = self.make_request("POST", "/notes", data)
-        
-        if response is None:
-            self.log_result("Create Note", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "id" in result and "content" in result:
-                self.log_result("Create Note", True, "Note created successfully")
-                return True
-            else:
-                self.log_result("Create Note", False, "Missing note data")
-                return False
-        else:
-            self.log_result("Create Note", False, f"Status {response.status_code}: {response.text}")
-            return False
+        return await self.run_case(
+            "Create Note", "POST", "/notes", has_keys("id", "content"),
+            lambda r: "Note created successfully", "Missing note data",
+            data=data, requires=CONTACT_REQUIRED
+        ) is not None
     
-    def test_get_contact_notes(self):
-        """Test getting notes for a contact"""
-        if not self.token or not self.test_contact_id:
-            self.log_result("Get Contact Notes", False, "No token or contact ID available")
-            return False
-        
-        response = self.make_request("GET", f"/notes/contact/{self.test_contact_id}")
-        
-        if response is None:
-            self.log_result("Get Contact Notes", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if isinstance(result, list):
-                self.log_result("Get Contact Notes", True, f"Retrieved {len(result)} notes")
-                return True
-            else:
-                self.log_result("Get Contact Notes", False, "Response is not a list")
-                return False
-        else:
-            self.log_result("Get Contact Notes", False, f"Status {response.status_code}: {response.text}")
-            return False
-    
-    def test_create_followup(self):
+    async def test_create_followup(self):
         """Test creating a follow-up"""
-        if not self.token or not self.test_contact_id:
-            self.log_result("Create Follow-up", False, "No token or contact ID available")
-            return False
-        
         # Schedule follow-up for tomorrow
         tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
         
@@ -476,232 +379,106 @@ class SmartCRMTester:
             "notes": "Test follow-up reminder"
         }
         
-        response = self.make_request("POST", "/followups", data)
-        
-        if response is None:
-            self.log_result("Create Follow-up", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "id" in result and "follow_up_date" in result:
-                self.test_followup_id = result["id"]
-                self.log_result("Create Follow-up", True, f"Follow-up scheduled for {result['follow_up_date']}")
-                return True
-            else:
-                self.log_result("Create Follow-up", False, "Missing follow-up data")
-                return False
-        else:
-            self.log_result("Create Follow-up", False, f"Status {response.status_code}: {response.text}")
+        result = await self.run_case(
+            "Create Follow-up", "POST", "/followups", has_keys("id", "follow_up_date"),
+            lambda r: f"Follow-up scheduled for {r['follow_up_date']}", "Missing follow-up data",
+            data=data, requires=CONTACT_REQUIRED
+        )
+        if result is None:
             return False
+        self.test_followup_id = result["id"]
+        return True
     
-    def test_get_followups(self):
-        """Test getting follow-ups"""
-        if not self.token:
-            self.log_result("Get Follow-ups", False, "No token available")
-            return False
-        
-        response = self.make_request("GET", "/followups")
-        
-        if response is None:
-            self.log_result("Get Follow-ups", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if isinstance(result, list):
-                self.log_result("Get Follow-ups", True, f"Retrieved {len(result)} follow-ups")
-                return True
-            else:
-                self.log_result("Get Follow-ups", False, "Response is not a list")
-                return False
-        else:
-            self.log_result("Get Follow-ups", False, f"Status {response.status_code}: {response.text}")
-            return False
+    def read_cases(self):
+        """GET-only tests with no dependency on each other:
+        (name, endpoint, expect, describe, failure, requires)"""
+        return [
+            ("Auth Me", "/auth/me", has_keys("id", "email"),
+             lambda r: f"User info retrieved: {r['email']}", "Missing user info in response", TOKEN_REQUIRED),
+            ("Contacts Count", "/contacts/count", has_keys("total", "by_status"),
+             lambda r: f"Total contacts: {r['total']}", "Missing count data in response", TOKEN_REQUIRED),
+            ("Get Contacts", "/contacts", is_list,
+             lambda r: f"Retrieved {len(r)} contacts", "Response is not a list", TOKEN_REQUIRED),
+            ("Get Contact By ID", f"/contacts/{self.test_contact_id}", lambda r: r.get("id") == self.test_contact_id,
+             lambda r: f"Contact retrieved: {r['phone']}", "Contact ID mismatch", CONTACT_REQUIRED),
+            ("Get Contact Notes", f"/notes/contact/{self.test_contact_id}", is_list,
+             lambda r: f"Retrieved {len(r)} notes", "Response is not a list", CONTACT_REQUIRED),
+            ("Get Follow-ups", "/followups", is_list,
+             lambda r: f"Retrieved {len(r)} follow-ups", "Response is not a list", TOKEN_REQUIRED),
+            ("Get Upcoming Follow-ups", "/followups/upcoming", has_keys("overdue", "upcoming"),
+             lambda r: f"Overdue: {len(r['overdue'])}, Upcoming: {len(r['upcoming'])}", "Missing follow-up categories", TOKEN_REQUIRED),
+            ("Get Activity Logs", "/activity-logs", is_list,
+             lambda r: f"Retrieved {len(r)} activity logs", "Response is not a list", TOKEN_REQUIRED),
+        ]
     
-    def test_get_upcoming_followups(self):
-        """Test getting upcoming follow-ups"""
-        if not self.token:
-            self.log_result("Get Upcoming Follow-ups", False, "No token available")
-            return False
-        
-        response = self.make_request("GET", "/followups/upcoming")
-        
-        if response is None:
-            self.log_result("Get Upcoming Follow-ups", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "overdue" in result and "upcoming" in result:
-                self.log_result("Get Upcoming Follow-ups", True, f"Overdue: {len(result['overdue'])}, Upcoming: {len(result['upcoming'])}")
-                return True
-            else:
-                self.log_result("Get Upcoming Follow-ups", False, "Missing follow-up categories")
-                return False
-        else:
-            self.log_result("Get Upcoming Follow-ups", False, f"Status {response.status_code}: {response.text}")
-            return False
+    async def run_read_tests(self):
+        """Run every read case concurrently"""
+        return await asyncio.gather(*(
+            self.run_case(name, "GET", endpoint, expect, describe, failure, requires=requires)
+            for name, endpoint, expect, describe, failure, requires in self.read_cases()
+        ))
     
-    def test_complete_followup(self):
+    async def test_complete_followup(self):
         """Test completing a follow-up"""
-        if not self.token or not self.test_followup_id:
-            self.log_result("Complete Follow-up", False, "No token or follow-up ID available")
-            return False
-        
-        response = self.make_request("PUT", f"/followups/{self.test_followup_id}/complete")
-        
-        if response is None:
-            self.log_result("Complete Follow-up", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "message" in result:
-                self.log_result("Complete Follow-up", True, "Follow-up completed successfully")
-                return True
-            else:
-                self.log_result("Complete Follow-up", False, "Missing completion message")
-                return False
-        else:
-            self.log_result("Complete Follow-up", False, f"Status {response.status_code}: {response.text}")
-            return False
-    
-    def test_get_activity_logs(self):
-        """Test getting activity logs"""
-        if not self.token:
-            self.log_result("Get Activity Logs", False, "No token available")
-            return False
-        
-        response = self.make_request("GET", "/activity-logs")
-        
-        if response is None:
-            self.log_result("Get Activity Logs", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if isinstance(result, list):
-                self.log_result("Get Activity Logs", True, f"Retrieved {len(result)} activity logs")
-                return True
-            else:
-                self.log_result("Get Activity Logs", False, "Response is not a list")
-                return False
-        else:
-            self.log_result("Get Activity Logs", False, f"Status {response.status_code}: {response.text}")
-            return False
-    
-    def test_duplicate_contact_prevention(self):
-        """Test duplicate contact prevention"""
-        if not self.token or not self.test_contact_id:
-            self.log_result("Duplicate Prevention", False, "No token or contact ID available")
-            return False
-        
-        # Get the phone number from the existing contact
-        response = self.make_request("GET", f"/contacts/{self.test_contact_id}")
-        if response is None or response.status_code != 200:
-            self.log_result("Duplicate Prevention", False, "Could not get existing contact")
-            return False
-        
-        existing_contact = response.json()
-        phone = existing_contact["phone"]
-        
-        # Try to create another contact with the same phone
-        data = {
-            "phone": phone,
-            "status": "Follow-up",
-            "data": {
-                "name": "Duplicate Test",
-                "email": "duplicate@example.com"
-            }
-        }
-        
-        response = self.make_request("POST", "/contacts", data)
-        
-        if response is None:
-            self.log_result("Duplicate Prevention", False, "Request failed")
-            return False
-        
-        if response.status_code == 400:
-            self.log_result("Duplicate Prevention", True, "Duplicate contact correctly rejected")
-            return True
-        else:
-            self.log_result("Duplicate Prevention", False, f"Expected 400, got {response.status_code}")
-            return False
+        return await self.run_case(
+            "Complete Follow-up", "PUT", f"/followups/{self.test_followup_id}/complete", has_keys("message"),
+            lambda r: "Follow-up completed successfully", "Missing completion message",
+            requires=(("token", "token"), ("test_followup_id", "follow-up ID"))
+        ) is not None
     
-    def test_delete_contact(self):
+    async def test_delete_contact(self):
         """Test deleting a contact (cleanup)"""
-        if not self.token or not self.test_contact_id:
-            self.log_result("Delete Contact", False, "No token or contact ID available")
-            return False
-        
-        response = self.make_request("DELETE", f"/contacts/{self.test_contact_id}")
-        
-        if response is None:
-            self.log_result("Delete Contact", False, "Request failed")
-            return False
-        
-        if response.status_code == 200:
-            result = response.json()
-            if "message" in result:
-                self.log_result("Delete Contact", True, "Contact deleted successfully")
-                return True
-            else:
-                self.log_result("Delete Contact", False, "Missing deletion message")
-                return False
-        else:
-            self.log_result("Delete Contact", False, f"Status {response.status_code}: {response.text}")
-            return False
+        return await self.run_case(
+            "Delete Contact", "DELETE", f"/contacts/{self.test_contact_id}", has_keys("message"),
+            lambda r: "Contact deleted successfully", "Missing deletion message",
+            requires=CONTACT_REQUIRED
+        ) is not None
     
-    def run_all_tests(self):
+    async def run_all_tests(self):
         """Run all tests in the correct order"""
         print(f"🚀 Starting SmartCRM Backend API Tests")
         print(f"📍 Base URL: {self.base_url}")
         print("=" * 60)
         
+        # A dead backend would otherwise fail every test one timeout at a time
+        if not await self.probe_backend():
+            print("❌ Backend not reachable, skipping all tests")
+            return False
+        
         # Authentication tests (must be first)
         print("\n🔐 AUTHENTICATION TESTS")
-        self.test_auth_signup()
-        self.test_auth_login()
-        self.test_auth_me()
-        
-        # Contact statistics
-        print("\n📊 CONTACT STATISTICS TESTS")
-        self.test_contacts_count()
+        await self.test_auth_signup()
+        await self.test_auth_login()
         
         # Contact management tests
         print("\n👥 CONTACT MANAGEMENT TESTS")
-        self.test_create_contact()
-        self.test_get_contacts()
-        self.test_get_contact_by_id()
-        self.test_update_contact()
-        self.test_log_call()
-        self.test_duplicate_contact_prevention()
+        await self.test_create_contact()
+        await self.test_update_contact()
+        await self.test_log_call()
+        await self.test_duplicate_contact_prevention()
         
-        # Excel import tests
+        # Excel import tests (independent of each other)
         print("\n📋 EXCEL IMPORT TESTS")
-        self.test_excel_preview()
-        self.test_excel_import()
+        await self.run_parallel(self.test_excel_preview, self.test_excel_import)
         
-        # Notes tests
+        # Notes and follow-ups the read tests below look for
         print("\n📝 NOTES SYSTEM TESTS")
-        self.test_create_note()
-        self.test_get_contact_notes()
+        await self.test_create_note()
         
-        # Follow-up tests
         print("\n⏰ FOLLOW-UP SYSTEM TESTS")
-        self.test_create_followup()
-        self.test_get_followups()
-        self.test_get_upcoming_followups()
-        self.test_complete_followup()
+        await self.test_create_followup()
+        
+        # Read-only tests: no test here depends on another, so they run concurrently
+        print("\n📊 READ TESTS (user, contacts, statistics, notes, follow-ups, activity logs)")
+        await self.run_read_tests()
         
-        # Activity logs
-        print("\n📋 ACTIVITY LOGS TESTS")
-        self.test_get_activity_logs()
+        # Completing the follow-up changes what the upcoming/follow-up lists return, so it runs after them
+        print("\n⏰ FOLLOW-UP COMPLETION TESTS")
+        await self.test_complete_followup()
         
         # Cleanup
         print("\n🧹 CLEANUP TESTS")
-        self.test_delete_contact()
+        await self.test_delete_contact()
         
         # Final results
         print("\n" + "=" * 60)
@@ -715,11 +492,23 @@ class SmartCRMTester:
             for error in self.results['errors']:
                 print(f"   • {error}")
         
+        # The slowest tests are where speeding up the suite (or the backend) pays off first
+        slowest = sorted(self.results['timings'].items(), key=lambda item: item[1], reverse=True)[:5]
+        if slowest:
+            print(f"\n⏱️ SLOWEST TESTS:")
+            for test_name, duration in slowest:
+                print(f"   • {test_name}: {duration * 1000:.0f} ms")
+        
         return self.results['failed'] == 0
 
 if __name__ == "__main__":
     tester = SmartCRMTester()
-    success = tester.run_all_tests()
+    
+    async def main():
+        async with tester.client:
+            return await tester.run_all_tests()
+    
+    success = asyncio.run(main())
     
     if success:
         print(f"\n🎉 All tests passed!")
@@ -21,8 +21,8 @@ const format12Hour = (dateString) => {
 // Helper functions for contact and follow-up display
 const getContactName = (followup) => {
   if (followup.contact) {
-    const name = followup.contact.data?.name || followup.contact.data?.Name || followup.contact.phone;
-    const shopName = followup.contact.data?.shop_name || followup.contact.data?.Shop_Name || followup.contact.data?.['Shop Name'];
+    const name = followup.contact.customer_name || followup.contact.phone;
+    const shopName = followup.contact.shop_name;
     return shopName ? `${shopName} (${name})` : name;
   }
   return followup.contact_id;
@@ -819,10 +819,16 @@ const DashboardView = ({ stats, followups }) => {
   const [selectedContact, setSelectedContact] = useState(null);
   const [showContactDetailModal, setShowContactDetailModal] = useState(false);
   
-  const openContactDetailModal = (followup) => {
+  const openContactDetailModal = async (followup) => {
     if (followup.contact) {
-      setSelectedContact(followup.contact);
-      setShowContactDetailModal(true);
+      // Follow-ups carry only a contact summary; the detail view needs the full contact
+      try {
+        const response = await axios.get(`${API}/contacts/${followup.contact_id}`);
+        setSelectedContact(response.data);
+        setShowContactDetailModal(true);
+      } catch (error) {
+        console.error('Error fetching contact:', error);
+      }
     }
   };
   
@@ -1751,10 +1757,16 @@ const FollowUpsView = ({
     setNextFollowupNotes('');
   };
   
-  const openContactDetailModal = (followup) => {
+  const openContactDetailModal = async (followup) => {
     if (followup.contact) {
-      setSelectedContact(followup.contact);
-      setShowContactDetailModal(true);
+      // Follow-ups carry only a contact summary; the detail view needs the full contact
+      try {
+        const response = await axios.get(`${API}/contacts/${followup.contact_id}`);
+        setSelectedContact(response.data);
+        setShowContactDetailModal(true);
+      } catch (error) {
+        console.error('Error fetching contact:', error);
+      }
     }
   };
 
@@ -3418,13 +3430,10 @@ const DemoReportsView = () => {
       const startDate = new Date(dateRange.start).toISOString();
       const endDate = new Date(dateRange.end + 'T23:59:59').toISOString();
       
-      const [reportResponse, summaryResponse] = await Promise.all([
-        axios.get(`${API}/demos/report?start=${startDate}&end=${endDate}&group_by=${groupBy}`),
-        axios.get(`${API}/demos/summary?start=${startDate}&end=${endDate}`)
-      ]);
+      const response = await axios.get(`${API}/demos/dashboard?start=${startDate}&end=${endDate}&group_by=${groupBy}`);
       
-      setReportData(reportResponse.data);
-      setSummary(summaryResponse.data);
+      setReportData(response.data.report);
+      setSummary(response.data.summary);
     } catch (error) {
       console.error('Failed to fetch demo report:', error);
     } finally {